@@ -18,16 +18,30 @@ Production-ready features:
 """
 
 import os
+import sys
+import atexit
 import logging
 import time
-import json
-from typing import Dict, List, Optional, Any, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Union, Iterator
+from collections import namedtuple
 from datetime import datetime, date
-from functools import wraps
+from functools import lru_cache, wraps
+import ijson
+import orjson
 import requests
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests.exceptions import Timeout, ConnectionError
 from dotenv import load_dotenv
 
+# Make the project root importable once so the training mode helper can be shared
+_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT not in sys.path:
+    sys.path.insert(0, _PARENT)
+from app import get_training_mode
+
 load_dotenv()
 
 # Configure logging
@@ -36,7 +50,43 @@ logger = logging.getLogger(__name__)
 # Configuration constants
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
+MAX_BACKOFF = 30  # seconds
+JITTER = 0.5  # max random seconds added to each backoff
 REQUEST_TIMEOUT = 30  # seconds
+AUTH_TOKEN_TTL = 1500  # seconds
+SYNC_CACHE_TTL = 300  # seconds driver/vehicle/vendor/room sync results are reused
+QA_CACHE_TTL = 3600  # seconds lab results for a barcode are reused
+QA_CACHE_MAXSIZE = 4096  # barcodes held in the QA check cache
+POOL_MAXSIZE = 16  # pooled connections per host, caps concurrent request workers
+# Transient statuses worth retrying; any other 4xx (bad credentials, malformed payload) fails fast
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Read-only record for synced drivers, vehicles and rooms
+SyncRecord = namedtuple("SyncRecord", "name is_active")
+
+# Static parts of each request payload; per-call fields are merged in
+_TEMPLATE_LOGIN = {"API": "4.0", "action": "login"}
+_TEMPLATE_SYNC_EMPLOYEE = {"API": "4.0", "action": "sync_employee", "active": "1"}
+_TEMPLATE_SYNC_VEHICLE = {"API": "4.0", "action": "sync_vehicle", "active": "1"}
+_TEMPLATE_SYNC_VENDOR = {"API": "4.0", "action": "sync_vendor"}
+_TEMPLATE_SYNC_ROOM = {"API": "4.0", "action": "sync_inventory_room", "active": "1"}
+_TEMPLATE_SYNC_INVENTORY = {"API": "4.0", "action": "sync_inventory", "active": "1"}
+_TEMPLATE_QA_CHECK = {"API": "4.0", "action": "inventory_qa_check_all"}
+_TEMPLATE_SPLIT = {"API": "4.0", "action": "inventory_split"}
+_TEMPLATE_MOVE = {"API": "4.0", "action": "inventory_move"}
+_TEMPLATE_MANIFEST = {"API": "4.0", "action": "inventory_manifest"}
+_REQUIRED_MANIFEST_FIELDS = frozenset({
+    "approximate_departure", "approximate_arrival", "approximate_route",
+    "stop_number", "barcodeid", "vendor_license"
+})
+
+# Sync collections returned as id -> SyncRecord; room ids keep BioTrack's type to match inventory 'currentroom'
+_SyncSpec = namedtuple("_SyncSpec", "template list_key id_key name_key id_type")
+SYNC_SPECS = {
+    "driver": _SyncSpec(_TEMPLATE_SYNC_EMPLOYEE, "employee", "employee_id", "employee_name", str),
+    "vehicle": _SyncSpec(_TEMPLATE_SYNC_VEHICLE, "vehicle", "vehicle_id", "nickname", str),
+    "room": _SyncSpec(_TEMPLATE_SYNC_ROOM, "inventory_room", "roomid", "name", lambda room_id: room_id),
+}
 
 # Environment variables
 BIOTRACK_API_URL = os.getenv("BIOTRACK_API_URL")
@@ -45,9 +95,54 @@ BIOTRACK_PASSWORD = os.getenv("BIOTRACK_PASSWORD")
 BIOTRACK_UBI = os.getenv("BIOTRACK_UBI")
 BIOTRACK_DEFAULT_LOCATION = os.getenv("BIOTRACK_DEFAULT_LOCATION", "ACFB0000681")
 
+# Shared HTTP session so sequential BioTrack calls reuse the keep-alive connection.
+# Retries with capped, jittered exponential backoff run inside the connection pool.
+_RETRY = Retry(
+    total=MAX_RETRIES,
+    backoff_factor=RETRY_DELAY,
+    backoff_max=MAX_BACKOFF,
+    backoff_jitter=JITTER,
+    status_forcelist=RETRYABLE_STATUS_CODES,
+    allowed_methods={"POST"},
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+# Mutating actions (split, move, manifest) are not idempotent: only retry failures to connect,
+# never after the request may have reached BioTrack (read errors or error statuses).
+_WRITE_RETRY = Retry(
+    total=MAX_RETRIES,
+    read=0,
+    other=0,
+    status_forcelist=(),
+    backoff_factor=RETRY_DELAY,
+    backoff_max=MAX_BACKOFF,
+    backoff_jitter=JITTER,
+    raise_on_status=False
+)
+_SESSION = requests.Session()
+_WRITE_SESSION = requests.Session()
+_JSON_HEADERS = {"Content-Type": "application/json"}
+for _scheme in ("https://", "http://"):
+    _SESSION.mount(_scheme, HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=_RETRY))
+    _WRITE_SESSION.mount(_scheme, HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=_WRITE_RETRY))
+
+
+def close_session() -> None:
+    """Close the shared BioTrack HTTP sessions and their pooled connections."""
+    _SESSION.close()
+    _WRITE_SESSION.close()
 
+
+atexit.register(close_session)
+
+# Process-level auth token cache so batch work logs in once per TTL window
+_TOKEN_CACHE = {"token": None, "expires_at": 0.0}
+_TOKEN_LOCK = threading.RLock()
+
+
+@lru_cache(maxsize=1)
 def validate_config() -> bool:
-    """Validate that all required environment variables are set."""
+    """Validate that all required environment variables are set (cached; use cache_clear() after env changes)."""
     required_vars = {
         "BIOTRACK_API_URL": BIOTRACK_API_URL,
         "BIOTRACK_USERNAME": BIOTRACK_USERNAME,
@@ -64,35 +159,27 @@ def validate_config() -> bool:
     return True
 
 
-def retry_on_failure(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
-    """Decorator to retry API calls with exponential backoff."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except (RequestException, Timeout, ConnectionError) as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        wait_time = delay * (2 ** attempt)  # Exponential backoff
-                        logger.warning(
-                            f"API call failed (attempt {attempt + 1}/{max_retries + 1}): "
-                            f"{func.__name__} - {str(e)}. Retrying in {wait_time}s..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        logger.error(
-                            f"API call failed after {max_retries + 1} attempts: "
-                            f"{func.__name__} - {str(e)}"
-                        )
-                        raise last_exception
-            
-            return None
-        return wrapper
-    return decorator
+class _TokenBucket:
+    """Thread-safe token bucket that refills `rate` tokens per second."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
 
 
 def validate_token(token: str) -> bool:
@@ -103,6 +190,25 @@ def validate_token(token: str) -> bool:
     return True
 
 
+def _is_success(response_data: Any) -> bool:
+    """Check whether a BioTrack response reports success ("1" as a string or int)."""
+    if not response_data:
+        return False
+    success = response_data.get("success")
+    return success == "1" or success == 1
+
+
+def _is_session_error(response_data: Any) -> bool:
+    """Check whether a BioTrack response rejected the session token."""
+    if not isinstance(response_data, dict):
+        return False
+    success = response_data.get("success")
+    if success != "0" and success != 0:
+        return False
+    return "session" in str(response_data.get("error", "")).lower()
+
+
+@lru_cache(maxsize=4)
 def validate_training_mode(training: str) -> str:
     """Validate and normalize training mode parameter."""
     if training not in ["0", "1"]:
@@ -111,37 +217,96 @@ def validate_training_mode(training: str) -> str:
     return training
 
 
-@retry_on_failure()
-def _make_api_request(data: Dict[str, Any], action: str) -> Optional[Dict[str, Any]]:
+def _iter_response_items(data: Dict[str, Any], action: str, stream_items: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects in a response's `stream_items` array as they are parsed off the socket.
+    
+    Top-level scalars such as success/error are collected on the way; a response without the
+    array, or one reporting failure, raises ValueError (clearing the cached token on session errors).
+    """
+    logger.debug(f"Making streamed BioTrack API request: {action}")
+    item_prefix = f"{stream_items}.item"
+    summary = {}
+    found_items = False
+    builder = None
+    with _SESSION.post(
+        BIOTRACK_API_URL,
+        data=orjson.dumps(data),
+        headers=_JSON_HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        stream=True
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == item_prefix and event in ("end_map", "end_array"):
+                    yield builder.value
+                    builder = None
+            elif prefix == item_prefix:
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                else:
+                    yield value
+            elif prefix == stream_items and event == "start_array":
+                found_items = True
+            elif "." not in prefix and prefix and event in ("string", "number", "boolean", "null"):
+                summary[prefix] = value
+    
+    if not found_items or summary.get("success") in ("0", 0):
+        if _is_session_error(summary):
+            logger.warning(f"BioTrack session rejected for {action}, clearing cached token")
+            invalidate_token()
+        raise ValueError(f"{action} response missing '{stream_items}' field: {summary.get('error')}")
+
+
+def _make_api_request(
+    data: Dict[str, Any],
+    action: str,
+    stream_items: Optional[str] = None,
+    mutating: bool = False
+) -> Optional[Union[Dict[str, Any], Iterator[Dict[str, Any]]]]:
     """
     Make a standardized API request to BioTrack with proper error handling.
     
     Args:
         data: Request payload
         action: API action being performed (for logging)
+        stream_items: Top-level array key to stream item by item instead of loading the full body
+        mutating: True for non-idempotent actions, which are only retried on connection failures
     
     Returns:
-        Response JSON data or None if failed
+        Response JSON data, an iterator over the `stream_items` array, or None if failed
     """
     if not validate_config():
         raise ValueError("BioTrack configuration is invalid")
     
+    if stream_items:
+        return _iter_response_items(data, action, stream_items)
+    
     try:
         logger.debug(f"Making BioTrack API request: {action}")
         # BioTrack API expects form data, not JSON
-        response = requests.post(
+        session = _WRITE_SESSION if mutating else _SESSION
+        response = session.post(
             BIOTRACK_API_URL,
-            json=data,
+            data=orjson.dumps(data),
+            headers=_JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
         
         response.raise_for_status()
         
         try:
-            json_data = response.json()
-            logger.debug(f"BioTrack API response for {action}: {json_data}")
+            json_data = orjson.loads(response.content)
+            logger.debug("BioTrack API response for %s: %s", action, json_data)
+            if _is_session_error(json_data):
+                logger.warning(f"BioTrack session rejected for {action}, clearing cached token")
+                invalidate_token()
             return json_data
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response for {action}: {e}")
             raise
             
@@ -166,12 +331,6 @@ def get_auth_token() -> Optional[str]:
     Returns:
         Session token string or None if authentication failed
     """
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
     # Log authentication attempt details (without exposing credentials)
@@ -181,8 +340,7 @@ def get_auth_token() -> Optional[str]:
     logger.debug(f"License number provided: {bool(BIOTRACK_UBI)}")
     
     data = {
-        "API": "4.0",
-        "action": "login",
+        **_TEMPLATE_LOGIN,
         "username": BIOTRACK_USERNAME,
         "password": BIOTRACK_PASSWORD,
         "license_number": BIOTRACK_UBI
@@ -205,142 +363,134 @@ def get_auth_token() -> Optional[str]:
         return None
 
 
-def get_driver_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
+def get_cached_auth_token(ttl: int = AUTH_TOKEN_TTL) -> Optional[str]:
     """
-    Retrieve driver information from BioTrack.
+    Return a cached BioTrack session token, logging in only when it has expired.
     
     Args:
-        token: Authentication token
+        ttl: Seconds a freshly issued token is reused before logging in again
     
     Returns:
-        Dictionary mapping driver_id to driver details or None if failed
+        Session token string or None if authentication failed
     """
-    if not validate_token(token):
-        return None
-    
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
-    training = get_training_mode()
-    
-    data = {
-        "API": "4.0",
-        "action": "sync_employee",
-        "sessionid": token,
-        "active": "1",
-        "training": training
-    }
+    with _TOKEN_LOCK:
+        if _TOKEN_CACHE["token"] and time.time() < _TOKEN_CACHE["expires_at"]:
+            return _TOKEN_CACHE["token"]
+        
+        token = get_auth_token()
+        if token:
+            _TOKEN_CACHE["token"] = token
+            _TOKEN_CACHE["expires_at"] = time.time() + ttl
+        return token
+
+
+def invalidate_token() -> None:
+    """Drop the cached session token so the next call re-authenticates."""
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE["token"] = None
+        _TOKEN_CACHE["expires_at"] = 0.0
+
+
+def _ttl_cache(ttl_seconds: int, maxsize: int = 128):
+    """
+    Cache a BioTrack getter's non-None results per (training mode, arguments) for ttl_seconds.
     
-    try:
-        response_data = _make_api_request(data, "sync_employee")
+    The leading session token argument is left out of the key: callers log in per request, so
+    keying on it would never hit, and any valid token returns the same data. The oldest entry is evicted once maxsize is reached, and the wrapped function gains an
+    invalidate() method that clears its cache.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
         
-        if response_data and "employee" in response_data:
-            drivers = response_data["employee"]
-            driver_dict = {}
-            
-            for driver in drivers:
-                try:
-                    driver_id = driver.get("employee_id")
-                    # Convert driver_id to string to match database schema
-                    driver_id = str(driver_id) if driver_id is not None else None
-                    driver_name = driver.get("employee_name", "Unknown")
-                    # 'deleted' field is 0 for active drivers, 1 for deleted (same as vehicles)
-                    driver_is_active = 1 if driver.get("deleted") == 0 else 0
-                    
-                    if driver_id:
-                        driver_dict[driver_id] = {
-                            "name": driver_name,
-                            "is_active": driver_is_active
-                        }
-                except KeyError as e:
-                    logger.warning(f"Driver data missing required field: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(driver_dict)} drivers from BioTrack")
-            return driver_dict
-        else:
-            logger.error("Driver info response missing 'employee' field")
-            return None
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (get_training_mode(), args[1:], tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry and entry[1] > now:
+                    return entry[0]
             
-    except Exception as e:
-        logger.error(f"Failed to get driver info: {e}")
+            # Failures return None and are not cached so the next call retries
+            value = func(*args, **kwargs)
+            if value is not None:
+                with lock:
+                    cache.pop(key, None)
+                    if len(cache) >= maxsize:
+                        del cache[next(iter(cache))]
+                    cache[key] = (value, now + ttl_seconds)
+            return value
+        
+        def invalidate() -> None:
+            with lock:
+                cache.clear()
+        
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
+
+
+def _parse_sync_records(response_data: Optional[Dict[str, Any]], kind: str) -> Optional[Dict[Any, SyncRecord]]:
+    """Build the id -> SyncRecord dictionary for a SYNC_SPECS collection response."""
+    spec = SYNC_SPECS[kind]
+    if not response_data or spec.list_key not in response_data:
+        logger.error(f"{kind.capitalize()} info response missing '{spec.list_key}' field")
         return None
+    
+    # 'deleted' field is 0 for active records, 1 for deleted
+    records = {
+        spec.id_type(record[spec.id_key]): SyncRecord(
+            record.get(spec.name_key, "Unknown"),
+            1 if record.get("deleted") == 0 else 0
+        )
+        for record in response_data[spec.list_key]
+        if record.get(spec.id_key) not in (None, "")
+    }
+    
+    logger.info(f"Retrieved {len(records)} {kind} records from BioTrack")
+    return records
 
 
-def get_vehicle_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
+def _sync_collection(token: str, kind: str) -> Optional[Dict[Any, SyncRecord]]:
     """
-    Retrieve vehicle information from BioTrack.
+    Retrieve one SYNC_SPECS collection from BioTrack.
     
     Args:
         token: Authentication token
+        kind: SYNC_SPECS key ("driver", "vehicle" or "room")
     
     Returns:
-        Dictionary mapping vehicle_id to vehicle details or None if failed
+        Dictionary mapping record id to a SyncRecord(name, is_active) or None if failed
     """
     if not validate_token(token):
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
-    training = get_training_mode()
-    
-    data = {
-        "API": "4.0",
-        "action": "sync_vehicle",
-        "sessionid": token,
-        "active": "1",
-        "training": training
-    }
+    spec = SYNC_SPECS[kind]
+    data = {**spec.template, "sessionid": token, "training": get_training_mode()}
     
     try:
-        response_data = _make_api_request(data, "sync_vehicle")
-        
-        if response_data and "vehicle" in response_data:
-            vehicles = response_data["vehicle"]
-            vehicle_dict = {}
-            
-            logger.debug(f"Raw vehicle response: {vehicles}")
-            
-            for vehicle in vehicles:
-                try:
-                    logger.debug(f"Processing vehicle: {vehicle}")
-                    vehicle_id = vehicle.get("vehicle_id")
-                    # Convert vehicle_id to string to match database schema
-                    vehicle_id = str(vehicle_id) if vehicle_id is not None else None
-                    # BioTrack API returns 'nickname' field, not 'vehicle_name'
-                    vehicle_name = vehicle.get("nickname", "Unknown")
-                    # 'deleted' field is 0 for active vehicles, 1 for deleted
-                    vehicle_is_active = 1 if vehicle.get("deleted") == 0 else 0
-                    
-                    logger.debug(f"Vehicle {vehicle_id}: name='{vehicle_name}', active={vehicle_is_active}")
-                    
-                    if vehicle_id:
-                        vehicle_dict[vehicle_id] = {
-                            "name": vehicle_name,
-                            "is_active": vehicle_is_active
-                        }
-                except KeyError as e:
-                    logger.warning(f"Vehicle data missing required field: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(vehicle_dict)} vehicles from BioTrack")
-            return vehicle_dict
-        else:
-            logger.error("Vehicle info response missing 'vehicle' field")
-            return None
+        response_data = _make_api_request(data, spec.template["action"])
+        return _parse_sync_records(response_data, kind)
             
     except Exception as e:
-        logger.error(f"Failed to get vehicle info: {e}")
+        logger.error(f"Failed to get {kind} info: {e}")
         return None
 
 
+@_ttl_cache(SYNC_CACHE_TTL)
+def get_driver_info(token: str) -> Optional[Dict[str, SyncRecord]]:
+    """Retrieve drivers from BioTrack as a mapping of driver_id to SyncRecord(name, is_active)."""
+    return _sync_collection(token, "driver")
+
+
+@_ttl_cache(SYNC_CACHE_TTL)
+def get_vehicle_info(token: str) -> Optional[Dict[str, SyncRecord]]:
+    """Retrieve vehicles from BioTrack as a mapping of vehicle_id to SyncRecord(name, is_active)."""
+    return _sync_collection(token, "vehicle")
+
+
+@_ttl_cache(SYNC_CACHE_TTL)
 def get_vendor_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
     """
     Retrieve vendor information from BioTrack.
@@ -355,20 +505,9 @@ def get_vendor_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
     if not validate_token(token):
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
-    data = {
-        "API": "4.0",
-        "action": "sync_vendor",
-        "sessionid": token,
-        "training": training
-    }
+    data = {**_TEMPLATE_SYNC_VENDOR, "sessionid": token, "training": training}
     
     try:
         response_data = _make_api_request(data, "vendor_info")
@@ -407,67 +546,39 @@ def get_vendor_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
         return None
 
 
-def get_room_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
+@_ttl_cache(SYNC_CACHE_TTL)
+def get_room_info(token: str) -> Optional[Dict[Any, SyncRecord]]:
+    """Retrieve rooms from BioTrack as a mapping of room_id to SyncRecord(name, is_active)."""
+    return _sync_collection(token, "room")
+
+
+def get_all_sync_info(token: str) -> Optional[Dict[str, Optional[Dict[Any, Any]]]]:
     """
-    Retrieve room/location information from BioTrack.
+    Retrieve drivers, vehicles, vendors and rooms from BioTrack concurrently.
+    
+    The cached getters run on worker threads over the pooled session, so each call keeps
+    the adapter's retries and the sync TTL cache while total time drops to the slowest call.
     
     Args:
         token: Authentication token
     
     Returns:
-        Dictionary mapping room_id to room details or None if failed
+        Dictionary with "drivers", "vehicles", "vendors" and "rooms" keys, each holding the
+        matching get_*_info result (None if that sync failed), or None if token invalid
     """
     if not validate_token(token):
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
-    training = get_training_mode()
-    
-    data = {
-        "API": "4.0",
-        "action": "sync_inventory_room",
-        "sessionid": token,
-        "active": "1",
-        "training": training
+    getters = {
+        "drivers": get_driver_info,
+        "vehicles": get_vehicle_info,
+        "vendors": get_vendor_info,
+        "rooms": get_room_info
     }
+    with ThreadPoolExecutor(max_workers=len(getters)) as executor:
+        futures = {name: executor.submit(getter, token) for name, getter in getters.items()}
     
-    try:
-        response_data = _make_api_request(data, "room_info")
-        
-        if response_data and "inventory_room" in response_data:
-            rooms = response_data["inventory_room"]
-            room_dict = {}
-            
-            for room in rooms:
-                try:
-                    room_id = room.get("roomid")
-                    room_name = room.get("name", "Unknown")
-                    # 'deleted' field is 0 for active rooms, 1 for deleted (same as drivers/vehicles)
-                    room_is_active = 1 if room.get("deleted") == 0 else 0
-                    
-                    if room_id:
-                        room_dict[room_id] = {
-                            "name": room_name,
-                            "is_active": room_is_active
-                        }
-                except KeyError as e:
-                    logger.warning(f"Room data missing required field: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(room_dict)} rooms from BioTrack")
-            return room_dict
-        else:
-            logger.error("Room info response missing 'inventory_room' field")
-            return None
-            
-    except Exception as e:
-        logger.error(f"Failed to get room info: {e}")
-        return None
+    return {name: future.result() for name, future in futures.items()}
 
 
 def get_inventory_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
@@ -483,50 +594,49 @@ def get_inventory_info(token: str) -> Optional[Dict[str, Dict[str, Any]]]:
     if not validate_token(token):
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
-    data = {
-        "API": "4.0",
-        "action": "sync_inventory",
-        "sessionid": token,
-        "active": "1",
-        "training": training
-    }
+    data = {**_TEMPLATE_SYNC_INVENTORY, "sessionid": token, "training": training}
     
     try:
-        response_data = _make_api_request(data, "inventory_info")
+        # Stream-parse the (potentially very large) inventory array item by item
+        inventory = _make_api_request(data, "inventory_info", stream_items="inventory")
+        inventory_dict = {}
         
-        if response_data and "inventory" in response_data:
-            inventory = response_data["inventory"]
-            inventory_dict = {}
-            
-            for item in inventory:
-                try:
-                    item_id = item.get("id")
-                    if item_id:
-                        # Return the full item data from BioTrack instead of just a subset
-                        inventory_dict[item_id] = item
-                except KeyError as e:
-                    logger.warning(f"Inventory item data missing required field: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(inventory_dict)} inventory items from BioTrack")
-            return inventory_dict
-        else:
-            logger.error("Inventory info response missing 'inventory' field")
-            return None
+        for item in inventory:
+            try:
+                item_id = item.get("id")
+                if item_id:
+                    # Return the full item data from BioTrack instead of just a subset
+                    inventory_dict[item_id] = item
+            except KeyError as e:
+                logger.warning(f"Inventory item data missing required field: {e}")
+                continue
+        
+        logger.info(f"Retrieved {len(inventory_dict)} inventory items from BioTrack")
+        return inventory_dict
             
     except Exception as e:
         logger.error(f"Failed to get inventory info: {e}")
         return None
 
 
+# Lab result keys mapped to BioTrack cannabinoid test fields
+_CANNABINOID_FIELDS = (("total", "Total"), ("thca", "THCA"), ("thc", "THC"), ("cbda", "CBDA"), ("cbd", "CBD"))
+
+
+def _extract_cannabinoid_results(test_data: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Pull cannabinoid (type 2) lab results out of a QA check test list."""
+    test = next((t for t in test_data if t.get("type") == 2), None)
+    if test is None:
+        return None
+    
+    lab_results = {key: test.get(field) for key, field in _CANNABINOID_FIELDS}
+    logger.debug("Found cannabinoid data: %s", lab_results)
+    return lab_results if any(lab_results.values()) else None
+
+
+@_ttl_cache(QA_CACHE_TTL, maxsize=QA_CACHE_MAXSIZE)
 def get_inventory_qa_check(token: str, barcode_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve lab test results for a specific inventory item from BioTrack.
@@ -545,17 +655,10 @@ def get_inventory_qa_check(token: str, barcode_id: str) -> Optional[Dict[str, An
         logger.error("Barcode ID is required for QA check")
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
     data = {
-        "API": "4.0",
-        "action": "inventory_qa_check_all",
+        **_TEMPLATE_QA_CHECK,
         "sessionid": token,
         "barcodeid": barcode_id
     }
@@ -565,7 +668,7 @@ def get_inventory_qa_check(token: str, barcode_id: str) -> Optional[Dict[str, An
         response_data = _make_api_request(data, "inventory_qa_check_all")
         
         # Log the full response for debugging
-        logger.debug(f"QA check response for barcode {barcode_id}: {response_data}")
+        logger.debug("QA check response for barcode %s: %s", barcode_id, response_data)
         
         if response_data:
             # Check for success in different possible formats
@@ -577,32 +680,19 @@ def get_inventory_qa_check(token: str, barcode_id: str) -> Optional[Dict[str, An
             if (success == 1 or success == "1"):
                 # Extract lab test data from the response - new structure has 'data' array
                 data_array = response_data.get("data", [])
-                logger.debug(f"Data array found: {data_array}")
+                logger.debug("Data array found: %s", data_array)
                 
                 if data_array:
                     # Get the first item from the data array
                     first_item = data_array[0]
                     test_data = first_item.get("test", [])
-                    logger.debug(f"Test data found: {test_data}")
-                    
-                    lab_results = {}
+                    logger.debug("Test data found: %s", test_data)
                     
-                    # Look for cannabinoid test results (type 2)
-                    for test in test_data:
-                        if test.get("type") == 2:
-                            lab_results = {
-                                "total": test.get("Total"),
-                                "thca": test.get("THCA"),
-                                "thc": test.get("THC"),
-                                "cbda": test.get("CBDA"),
-                                "cbd": test.get("CBD")
-                            }
-                            logger.debug(f"Found cannabinoid data: {lab_results}")
-                            break
+                    lab_results = _extract_cannabinoid_results(test_data)
                     
                     # Only return results if we found cannabinoid data
-                    if lab_results and any(lab_results.values()):
-                        logger.debug(f"Retrieved lab results for barcode {barcode_id}: {lab_results}")
+                    if lab_results:
+                        logger.debug("Retrieved lab results for barcode %s: %s", barcode_id, lab_results)
                         return lab_results
                     else:
                         logger.debug(f"No cannabinoid lab data found for barcode {barcode_id}")
@@ -622,6 +712,41 @@ def get_inventory_qa_check(token: str, barcode_id: str) -> Optional[Dict[str, An
         return None
 
 
+def get_inventory_qa_check_many(
+    token: str,
+    barcode_ids: List[str],
+    max_workers: int = 8,
+    rate_limit: float = 5
+) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+    """
+    Retrieve lab test results for many inventory items with concurrent per-barcode QA checks.
+    
+    Args:
+        token: Authentication token
+        barcode_ids: Barcode IDs of the inventory items
+        max_workers: Concurrent requests (capped at POOL_MAXSIZE)
+        rate_limit: Maximum QA check requests started per second
+    
+    Returns:
+        Dictionary mapping barcode_id to lab results (None when no data) or None if token invalid
+    """
+    if not validate_token(token):
+        return None
+    
+    barcode_ids = list(dict.fromkeys(str(barcode_id) for barcode_id in barcode_ids if barcode_id))
+    bucket = _TokenBucket(rate_limit)
+    
+    def check(barcode_id: str) -> Optional[Dict[str, Any]]:
+        bucket.acquire()
+        return get_inventory_qa_check(token, barcode_id)
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, POOL_MAXSIZE)) as executor:
+        results = dict(zip(barcode_ids, executor.map(check, barcode_ids)))
+    
+    logger.info(f"Retrieved QA checks for {len(barcode_ids)} barcodes")
+    return results
+
+
 def post_sublot(
     token: str, 
     sublot_id: str, 
@@ -676,12 +801,6 @@ def post_sublot(
         logger.error("Invalid sublot_id or move_info provided")
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
     # Validate move_info structure
@@ -691,8 +810,7 @@ def post_sublot(
             return None
     
     data = {
-        "API": "4.0",
-        "action": "inventory_split",
+        **_TEMPLATE_SPLIT,
         "sessionid": token,
         "sublot_id": sublot_id,
         "data": move_info,
@@ -700,9 +818,9 @@ def post_sublot(
     }
     
     try:
-        response_data = _make_api_request(data, "sublot_split")
+        response_data = _make_api_request(data, "sublot_split", mutating=True)
         
-        if response_data and str(response_data.get("success")) == "1":
+        if _is_success(response_data):
             sublot_ids = response_data.get("barcode_id", [])
             logger.info(f"Successfully created {len(sublot_ids)} sublot splits")
             return sublot_ids
@@ -767,12 +885,6 @@ def post_sublot_move(
         logger.error("Invalid move_info provided")
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
     # Validate move_info structure
@@ -782,17 +894,16 @@ def post_sublot_move(
             return None
     
     data = {
-        "API": "4.0",
-        "action": "inventory_move",
+        **_TEMPLATE_MOVE,
         "sessionid": token,
         "data": move_info,
         "training": training
     }
     
     try:
-        response_data = _make_api_request(data, "sublot_move")
+        response_data = _make_api_request(data, "sublot_move", mutating=True)
         
-        if response_data and str(response_data.get("success")) == "1":
+        if _is_success(response_data):
             logger.info("Successfully moved sublot(s)")
             return response_data
         else:
@@ -831,12 +942,6 @@ def post_sublot_bulk_create(
         logger.error("Invalid sublot_data provided")
         return None
     
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
     # Validate sublot_data structure
@@ -846,8 +951,7 @@ def post_sublot_bulk_create(
             return None
     
     data = {
-        "API": "4.0",
-        "action": "inventory_split",
+        **_TEMPLATE_SPLIT,
         "sessionid": token,
         "sublot_id": "bulk_create",
         "data": sublot_data,
@@ -855,9 +959,9 @@ def post_sublot_bulk_create(
     }
     
     try:
-        response_data = _make_api_request(data, "sublot_bulk_create")
+        response_data = _make_api_request(data, "sublot_bulk_create", mutating=True)
         
-        if response_data and str(response_data.get("success")) == "1":
+        if _is_success(response_data):
             sublot_ids = response_data.get("barcode_id", [])
             logger.info(f"Successfully created {len(sublot_ids)} sublots in bulk")
             return sublot_ids
@@ -927,7 +1031,7 @@ def post_manifest(
             - stop_number: Always "1"
             - barcodeid: List of barcode IDs
             - vendor_license: Vendor license number
-        drivers: Driver ID(s) - list of strings
+        drivers: Driver ID or list of one or two driver IDs
         vehicle: Vehicle ID
         location: Location (license) ID; if not provided, uses BIOTRACK_DEFAULT_LOCATION from env
     
@@ -944,42 +1048,34 @@ def post_manifest(
     if location is None:
         location = BIOTRACK_DEFAULT_LOCATION
 
-    # Import training mode function from app
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app import get_training_mode
-    
     training = get_training_mode()
     
-    # Validate required manifest_info fields
-    required_fields = ["approximate_departure", "approximate_arrival", "approximate_route", 
-                      "stop_number", "barcodeid", "vendor_license"]
-    for field in required_fields:
-        if field not in manifest_info:
-            logger.error(f"Missing required field in manifest_info: {field}")
-            return None
+    missing_fields = _REQUIRED_MANIFEST_FIELDS - manifest_info.keys()
+    if missing_fields:
+        logger.error(f"Missing required fields in manifest_info: {', '.join(sorted(missing_fields))}")
+        return None
     
     # Normalize drivers to list format
     if isinstance(drivers, str):
         drivers = [drivers]
     
     data = {
-        "API": "4.0",
-        "action": "inventory_manifest",
+        **_TEMPLATE_MANIFEST,
         "sessionid": token,
         "location": location,
         "stop_overview": manifest_info,
         "employee_id": drivers[0],
-        "employee_id_2": drivers[1],
         "vehicle_id": vehicle,
         "training": training
     }
-    
+    # Second driver is optional; single-driver trips omit it instead of raising IndexError
+    if len(drivers) > 1:
+        data["employee_id_2"] = drivers[1]
+
     try:
-        response_data = _make_api_request(data, "manifest_creation")
+        response_data = _make_api_request(data, "manifest_creation", mutating=True)
         
-        if response_data and str(response_data.get("success")) == "1":
+        if _is_success(response_data):
             logger.info("Successfully created inventory manifest")
             return response_data.get("barcode_id")
         else:
@@ -8,17 +8,26 @@ Features:
 - Route generation from address list using Google Maps Routes API
 - Turn-by-turn direction generation from Google Maps navigation instructions
 - Unix timestamp calculation with delivery buffers
-- Error handling and retry logic
+- Multi-stop routes fetched as waypoint requests, one leg per delivery
+- Error handling and retry logic, with a circuit breaker during API outages
 """
 
 import os
-import json
+import re
+import asyncio
+import hashlib
 import logging
+import random
+import threading
 import time
-import requests
+import httpx
+import orjson
+from concurrent.futures import Future
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-from utils.timezone import get_est_now, US_EASTERN, ensure_est_timezone
+from datetime import datetime
+from utils.timezone import get_est_now, US_EASTERN, US_EASTERN_TZ, ensure_est_timezone
+from utils.cache import get as cache_get, set as cache_set
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,6 +35,81 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Time allowed at each stop before departing for the next one
+DELIVERY_BUFFER_SECONDS = 15 * 60
+
+_METERS_TO_MILES = 1 / 1609.34
+
+# Longer route text is cut to the first MAX_INSTRUCTIONS steps
+MAX_ROUTE_TEXT_LENGTH = 1500
+MAX_INSTRUCTIONS = 10
+
+# Duration strings like "15m30s" or "1h15m30s"
+_DURATION_RE = re.compile(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?')
+
+# Address variants that geocode identically, folded together for route cache keys
+_ADDRESS_PUNCTUATION_RE = re.compile(r'[.,#]')
+_ADDRESS_SUFFIXES = {
+    'st': 'street', 'ave': 'avenue', 'rd': 'road', 'dr': 'drive',
+    'ln': 'lane', 'blvd': 'boulevard', 'hwy': 'highway'
+}
+
+
+# Route generations currently running, keyed by trip inputs, so concurrent duplicates share one result
+_inflight_routes: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Circuit breaker: after consecutive failed route requests, skip the API for a cool-off window
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 30
+_breaker = {'failures': 0, 'opened_at': 0.0}
+_breaker_lock = threading.Lock()
+
+
+def _breaker_allows_request() -> bool:
+    """False while the circuit is open; once the cool-off ends, let a single probe request through."""
+    with _breaker_lock:
+        if _breaker['failures'] < BREAKER_FAILURE_THRESHOLD:
+            return True
+        now = time.monotonic()
+        if now - _breaker['opened_at'] < BREAKER_COOLDOWN_SECONDS:
+            return False
+        _breaker['opened_at'] = now  # half-open: further callers wait for this probe
+        return True
+
+
+def _record_breaker_result(success: bool) -> None:
+    """Reset the breaker on success; count the failure and (re)open it otherwise."""
+    with _breaker_lock:
+        if success:
+            _breaker['failures'] = 0
+        else:
+            _breaker['failures'] += 1
+            if _breaker['failures'] >= BREAKER_FAILURE_THRESHOLD:
+                _breaker['opened_at'] = time.monotonic()
+
+
+@lru_cache(maxsize=1024)
+def _normalize_address(address: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace and spell out street suffixes."""
+    words = _ADDRESS_PUNCTUATION_RE.sub(' ', address.lower()).split()
+    return ' '.join(_ADDRESS_SUFFIXES.get(word, word) for word in words)
+
+
+def _parse_start_time(value: str) -> datetime:
+    """Parse 'YYYY-MM-DD HH:MM AM/PM' by splitting instead of strptime; raises ValueError if malformed."""
+    try:
+        date_part, time_part, meridiem = value.split()
+        hour, minute = map(int, time_part.split(':'))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid start time: {value!r}")
+    meridiem = meridiem.upper()
+    if not 1 <= hour <= 12 or meridiem not in ('AM', 'PM'):
+        raise ValueError(f"Invalid start time: {value!r}")
+    hour = hour % 12 + (12 if meridiem == 'PM' else 0)
+    return datetime.fromisoformat(date_part).replace(hour=hour, minute=minute)
+
+
 class GoogleMapsClient:
     """
     Google Maps Routes API client for delivery route generation.
@@ -34,6 +118,26 @@ class GoogleMapsClient:
     timing calculations including 15-minute delivery buffers.
     """
     
+    # Origin address (warehouse)
+    origin_address = "159 E Main St, Bristol, CT, 06010"
+    
+    # Warehouse latLng waypoint, learned from the first route response so later requests skip geocoding it
+    _origin_waypoint = None
+    
+    # Routing options shared by every computeRoutes request
+    _BASE_PAYLOAD = {
+        "travelMode": "DRIVE",
+        "routingPreference": "TRAFFIC_AWARE",
+        "computeAlternativeRoutes": False,
+        "routeModifiers": {
+            "avoidTolls": False,
+            "avoidHighways": False,
+            "avoidFerries": False
+        },
+        "languageCode": "en-US",
+        "units": "IMPERIAL"
+    }
+    
     def __init__(self):
         """Initialize Google Maps API client with configuration."""
         self.api_key = os.getenv('GOOGLE_MAPS_API_KEY')
@@ -44,14 +148,15 @@ class GoogleMapsClient:
         self.headers = {
             'Content-Type': 'application/json',
             'X-Goog-Api-Key': self.api_key,
-            'X-Goog-FieldMask': 'routes.duration,routes.distanceMeters,routes.legs.steps.navigationInstruction,routes.legs.steps.distanceMeters,routes.legs.steps.staticDuration'
+            'X-Goog-FieldMask': 'routes.legs.duration,routes.legs.distanceMeters,routes.legs.steps.navigationInstruction.instructions,routes.legs.steps.distanceMeters,routes.legs.startLocation.latLng'
         }
         
+        self.max_intermediates = 25  # Routes API waypoint limit per computeRoutes request
         self.max_retries = 3
+        self.route_cache_ttl = 21600  # seconds; traffic-aware routes go stale within hours
         self.retry_delay = 1  # seconds
-        
-        # Origin address (warehouse)
-        self.origin_address = "159 E Main St, Bristol, CT, 06010"
+        self.max_backoff = 30  # seconds
+        self.max_concurrency = int(os.getenv('GMAPS_MAX_CONCURRENCY', '5'))  # in-flight route requests
         
         logger.info("Google Maps API client initialized successfully")
     
@@ -93,6 +198,28 @@ class GoogleMapsClient:
             logger.error("No addresses provided for route generation")
             return None
         
+        # Collapse identical concurrent requests (e.g. a double-clicked regenerate) into one generation
+        key = hashlib.blake2b(orjson.dumps([addresses, delivery_date, approx_start_time]), digest_size=16).hexdigest()
+        with _inflight_lock:
+            future = _inflight_routes.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = _inflight_routes[key] = Future()
+        if not is_owner:
+            logger.info("Identical route generation already in progress; waiting for its result")
+            return future.result()
+        
+        route_segments = None
+        try:
+            route_segments = self._generate_timed_route_segments(addresses, delivery_date, approx_start_time)
+            return route_segments
+        finally:
+            future.set_result(route_segments)
+            with _inflight_lock:
+                _inflight_routes.pop(key, None)
+    
+    def _generate_timed_route_segments(self, addresses: List[str], delivery_date: str, approx_start_time: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch route legs and stamp them with departure and arrival times."""
         try:
             # Generate routes between consecutive addresses
             route_segments = self._generate_route_segments(addresses)
@@ -112,143 +239,182 @@ class GoogleMapsClient:
     def _generate_route_segments(self, addresses: List[str]) -> Optional[List[Dict[str, Any]]]:
         """Generate route segments between consecutive addresses."""
         try:
-            route_segments = []
-            
-            # Create full address list including origin
-            full_addresses = [self.origin_address] + addresses
+            return asyncio.run(self._generate_route_segments_async(addresses))
+        except Exception as e:
+            logger.error(f"Route segment generation failed: {str(e)}")
+            return None
+    
+    async def _generate_route_segments_async(self, addresses: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the route legs with one waypoint request per batch of stops, batches running concurrently."""
+        route_segments = []
+        
+        # Create full address list including origin
+        full_addresses = [self.origin_address] + addresses
+        
+        # Each request covers up to max_intermediates + 1 legs and starts where the previous one ended
+        legs_per_request = self.max_intermediates + 1
+        route_batches = [
+            full_addresses[start:start + legs_per_request + 1]
+            for start in range(0, len(addresses), legs_per_request)
+        ]
+        
+        # Cap in-flight requests so long trips stay under the per-minute quota instead of bursting into 429s
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # HTTP/2 multiplexes the concurrent requests over one pooled TLS connection
+        async with httpx.AsyncClient(http2=True, headers=self.headers, timeout=30) as client:
+            route_results = await asyncio.gather(*(
+                self._get_route_async(client, semaphore, route_addresses) for route_addresses in route_batches
+            ))
+        
+        for route_addresses, route_data in zip(route_batches, route_results):
+            legs = route_data.get('legs', []) if route_data else []
+            if len(legs) != len(route_addresses) - 1:
+                logger.error(f"Failed to get route from {route_addresses[0]} to {route_addresses[-1]}")
+                return None
             
-            # Generate routes between consecutive addresses
-            for i in range(len(full_addresses) - 1):
-                origin = full_addresses[i]
-                destination = full_addresses[i + 1]
-                
-                logger.debug(f"Generating route from {origin} to {destination}")
-                
-                # Get route data from Google Maps
-                route_data = self._get_route_between_addresses(origin, destination)
-                if not route_data:
-                    logger.error(f"Failed to get route from {origin} to {destination}")
-                    return None
-                
+            for leg in legs:
                 # Extract navigation instructions
-                route_text = self._format_navigation_instructions(route_data)
+                route_text = self._format_navigation_instructions(leg)
                 
                 # Create route segment
                 segment = {
                     'departure_time': 0,  # Will be calculated later
                     'arrival_time': 0,    # Will be calculated later
                     'route': route_text,
-                    'duration_seconds': self._extract_duration_seconds(route_data),
-                    'distance_meters': self._extract_distance_meters(route_data)
+                    'duration_seconds': self._extract_duration_seconds(leg),
+                    'distance_meters': self._extract_distance_meters(leg)
                 }
                 
                 route_segments.append(segment)
-                logger.debug(f"Created route segment {i+1} with {len(route_text)} characters")
-            
-            return route_segments
-            
-        except Exception as e:
-            logger.error(f"Route segment generation failed: {str(e)}")
-            return None
+                logger.debug("Created route segment %d with %d characters", len(route_segments), len(route_text))
+        
+        return route_segments
     
-    def _get_route_between_addresses(self, origin: str, destination: str) -> Optional[Dict[str, Any]]:
-        """Get route data between two addresses using Google Maps API."""
-        payload = {
-            "origin": {"address": origin},
+    async def _get_route_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, route_addresses: List[str]) -> Optional[Dict[str, Any]]:
+        """Get route data through route_addresses in order, with one leg per consecutive pair."""
+        origin = route_addresses[0]
+        destination = route_addresses[-1]
+        
+        # Repeat routes (same warehouse, same stops) are served from cache instead of a billed request
+        cache_key = "gmaps_route_" + hashlib.blake2b(
+            "|".join([*map(_normalize_address, route_addresses), self._BASE_PAYLOAD["routingPreference"]]).encode(),
+            digest_size=16
+        ).hexdigest()
+        cached_route = cache_get(cache_key)
+        if cached_route is not None:
+            logger.debug("Returning cached route from %s to %s", origin, destination)
+            return cached_route
+        
+        if not _breaker_allows_request():
+            logger.warning("Google Maps circuit open after repeated failures; skipping route from %s to %s", origin, destination)
+            return None
+        
+        body = orjson.dumps({
+            **self._BASE_PAYLOAD,
+            "origin": (GoogleMapsClient._origin_waypoint if origin == self.origin_address else None) or {"address": origin},
             "destination": {"address": destination},
-            "travelMode": "DRIVE",
-            "routingPreference": "TRAFFIC_AWARE",
-            "computeAlternativeRoutes": False,
-            "routeModifiers": {
-                "avoidTolls": False,
-                "avoidHighways": False,
-                "avoidFerries": False
-            },
-            "languageCode": "en-US",
-            "units": "IMPERIAL"
-        }
+            "intermediates": [{"address": address} for address in route_addresses[1:-1]]
+        })
         
         for attempt in range(self.max_retries):
             try:
-                logger.debug(f"Making Google Maps API request (attempt {attempt + 1})")
+                logger.debug("Generating route from %s to %s via %d stops (attempt %d)", origin, destination, len(route_addresses) - 2, attempt + 1)
                 
-                response = requests.post(
-                    self.base_url, 
-                    headers=self.headers, 
-                    json=payload,
-                    timeout=30
-                )
+                async with semaphore:
+                    response = await client.post(self.base_url, content=body)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     if 'routes' in data and data['routes']:
-                        logger.debug(f"Successfully retrieved route data")
-                        return data['routes'][0]
+                        logger.debug("Successfully retrieved route data")
+                        route = data['routes'][0]
+                        if origin == self.origin_address and GoogleMapsClient._origin_waypoint is None:
+                            self._remember_origin_location(route)
+                        cache_set(cache_key, route, ttl_seconds=self.route_cache_ttl)
+                        _record_breaker_result(True)
+                        return route
                     else:
+                        # The API answered; an unroutable trip says nothing about its health
                         logger.error(f"No route found between {origin} and {destination}")
+                        _record_breaker_result(True)
                         return None
-                elif response.status_code == 429:  # Rate limit
-                    logger.warning(f"Rate limit exceeded (attempt {attempt + 1})")
+                elif response.status_code == 429 or response.status_code >= 500:  # Rate limit or server error
+                    logger.warning(f"API Error {response.status_code} (attempt {attempt + 1})")
                     if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay * (2 ** attempt))
+                        await asyncio.sleep(self._retry_delay_seconds(attempt, response))
                         continue
                     else:
-                        logger.error("Max retries exceeded for rate limit")
+                        logger.error(f"Max retries exceeded, API Error {response.status_code}: {response.text}")
+                        _record_breaker_result(False)
                         return None
                 else:
+                    # Other client errors (bad key, invalid request) will not succeed on retry
                     logger.error(f"API Error {response.status_code}: {response.text}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay)
-                        continue
-                    else:
-                        return None
+                    _record_breaker_result(True)
+                    return None
                         
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 logger.error(f"Request error (attempt {attempt + 1}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    await asyncio.sleep(self._retry_delay_seconds(attempt))
                     continue
                 else:
+                    _record_breaker_result(False)
                     return None
             except Exception as e:
                 logger.error(f"Unexpected error in route request: {str(e)}")
+                _record_breaker_result(False)
                 return None
         
         return None
     
-    def _format_navigation_instructions(self, route_data: Dict[str, Any]) -> str:
-        """Format navigation instructions from Google Maps route data."""
+    def _remember_origin_location(self, route: Dict[str, Any]) -> None:
+        """Keep the warehouse latLng from a route's first leg for later origin waypoints."""
+        legs = route.get('legs') or [{}]
+        lat_lng = legs[0].get('startLocation', {}).get('latLng')
+        if lat_lng:
+            GoogleMapsClient._origin_waypoint = {"location": {"latLng": lat_lng}}
+            logger.info(f"Resolved warehouse origin to {lat_lng}")
+    
+    def _retry_delay_seconds(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Capped exponential backoff with full jitter, raised to the server's Retry-After when given."""
+        delay = random.uniform(0, min(self.retry_delay * (2 ** attempt), self.max_backoff))
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+    
+    def _format_navigation_instructions(self, leg: Dict[str, Any]) -> str:
+        """Format navigation instructions for one Google Maps route leg."""
         try:
             instructions = []
-            legs = route_data.get('legs', [])
-            
-            for leg in legs:
-                steps = leg.get('steps', [])
-                for i, step in enumerate(steps, 1):
-                    navigation = step.get('navigationInstruction', {})
-                    instruction = navigation.get('instructions', 'Continue straight')
-                    distance = step.get('distanceMeters', 0)
-                    
-                    # Format instruction with distance if available
-                    if distance > 0:
-                        distance_miles = distance / 1609.34
-                        if distance_miles >= 0.1:  # Only show distance for significant segments
-                            instructions.append(f"{i}. {instruction} ({distance_miles:.1f} mi)")
-                        else:
-                            instructions.append(f"{i}. {instruction}")
-                    else:
-                        instructions.append(f"{i}. {instruction}")
+            text_length = -1  # newline separators: one fewer than instructions
             
-            # Join instructions and limit length
-            route_text = '\n'.join(instructions)
+            for i, step in enumerate(leg.get('steps', []), 1):
+                navigation = step.get('navigationInstruction', {})
+                instruction = navigation.get('instructions', 'Continue straight')
+                distance_miles = step.get('distanceMeters', 0) * _METERS_TO_MILES
+                
+                # Only show distance for significant segments
+                if distance_miles >= 0.1:
+                    line = f"{i}. {instruction} ({distance_miles:.1f} mi)"
+                else:
+                    line = f"{i}. {instruction}"
+                instructions.append(line)
+                text_length += len(line) + 1
+                
+                # Over the length limit only the first MAX_INSTRUCTIONS are kept, so stop once past them
+                if text_length > MAX_ROUTE_TEXT_LENGTH and len(instructions) > MAX_INSTRUCTIONS:
+                    break
             
             # Limit to reasonable length for route instructions
-            if len(route_text) > 1500:
-                # Keep first 10 instructions and truncate
-                limited_instructions = instructions[:10]
-                route_text = '\n'.join(limited_instructions)
-                if len(limited_instructions) < len(instructions):
+            if text_length > MAX_ROUTE_TEXT_LENGTH:
+                route_text = '\n'.join(instructions[:MAX_INSTRUCTIONS])
+                if len(instructions) > MAX_INSTRUCTIONS:
                     route_text += "\n[Route continues with similar directions]"
+            else:
+                route_text = '\n'.join(instructions)
             
             return route_text
             
@@ -257,13 +423,14 @@ class GoogleMapsClient:
             return "Route directions not available"
     
     def _extract_duration_seconds(self, route_data: Dict[str, Any]) -> int:
-        """Extract duration in seconds from route data."""
+        """Extract duration in seconds from route or leg data."""
         try:
             duration = route_data.get('duration', '0s')
             if isinstance(duration, str):
-                # Parse duration string like "15m30s" or "1h15m30s"
-                import re
-                match = re.match(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?', duration)
+                # Routes API returns plain seconds such as "1234s"
+                if duration.endswith('s') and duration[:-1].isdigit():
+                    return int(duration[:-1])
+                match = _DURATION_RE.match(duration)
                 if match:
                     hours = int(match.group(1) or 0)
                     minutes = int(match.group(2) or 0)
@@ -275,7 +442,7 @@ class GoogleMapsClient:
             return 0
     
     def _extract_distance_meters(self, route_data: Dict[str, Any]) -> int:
-        """Extract distance in meters from route data."""
+        """Extract distance in meters from route or leg data."""
         try:
             return route_data.get('distanceMeters', 0)
         except Exception as e:
@@ -297,36 +464,35 @@ class GoogleMapsClient:
         try:
             # Parse delivery date and start time
             try:
-                start_datetime = datetime.strptime(approx_start_time, '%Y-%m-%d %I:%M %p')
+                start_datetime = _parse_start_time(approx_start_time)
             except ValueError:
                 # Fallback to delivery date with 8 AM start
-                start_datetime = datetime.strptime(delivery_date, '%Y-%m-%d')
-                start_datetime = start_datetime.replace(hour=8, minute=0, second=0, microsecond=0)
+                start_datetime = datetime.fromisoformat(delivery_date).replace(hour=8, minute=0, second=0, microsecond=0)
                 logger.warning("Invalid start time format, using 8 AM as default")
             
             # Ensure timezone-aware datetime with DST handling
             start_datetime = ensure_est_timezone(start_datetime)
             
-            current_time = start_datetime
+            # Convert once, then advance the Unix timestamp with integer arithmetic
+            current_time = int(start_datetime.timestamp())
+            last_index = len(route_segments) - 1
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
             for i, segment in enumerate(route_segments):
                 # Calculate departure and arrival times
                 departure_time = current_time
-                arrival_time = departure_time + timedelta(seconds=segment.get('duration_seconds', 900))  # Default 15 minutes
+                arrival_time = departure_time + int(segment.get('duration_seconds', 900))  # Default 15 minutes
                 
                 # Update segment with Unix timestamps
-                segment['departure_time'] = int(departure_time.timestamp())
-                segment['arrival_time'] = int(arrival_time.timestamp())
-                
-                # Update current time for next segment
-                current_time = arrival_time
+                segment['departure_time'] = departure_time
+                segment['arrival_time'] = arrival_time
                 
-                # Add 15-minute buffer for delivery processing (except for last stop)
-                if i < len(route_segments) - 1:
-                    current_time += timedelta(minutes=15)
+                # Update current time for next segment, adding the 15-minute delivery buffer (except for last stop)
+                current_time = arrival_time + (DELIVERY_BUFFER_SECONDS if i < last_index else 0)
                 
-                logger.debug(f"Segment {i+1}: Departure at {departure_time.strftime('%H:%M')}, "
-                           f"Arrival at {arrival_time.strftime('%H:%M')}")
+                if debug_enabled:
+                    logger.debug(f"Segment {i+1}: Departure at {datetime.fromtimestamp(departure_time, US_EASTERN_TZ).strftime('%H:%M')}, "
+                               f"Arrival at {datetime.fromtimestamp(arrival_time, US_EASTERN_TZ).strftime('%H:%M')}")
             
             logger.info(f"Calculated timestamps for {len(route_segments)} route segments")
             return route_segments
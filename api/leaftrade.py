@@ -26,15 +26,22 @@ are respected; do not add new direct HTTP calls that bypass this throttle.
 """
 
 import os
+import atexit
 import logging
+import random
 import time
-import json
 import threading
 from collections import deque
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Union, Iterator
 from datetime import datetime, date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from functools import wraps
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from requests.exceptions import RequestException, Timeout, ConnectionError
 from dotenv import load_dotenv
 
@@ -46,6 +53,7 @@ logger = logging.getLogger(__name__)
 # Configuration constants
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
+MAX_BACKOFF = 30  # seconds
 REQUEST_TIMEOUT = 30  # seconds
 
 # LeafTrade rate limits (from API docs). Enforced in _make_api_request().
@@ -55,11 +63,112 @@ LEAFTRADE_429_RETRY_AFTER = 61     # seconds before retry after 429
 _rate_limit_timestamps = deque(maxlen=LEAFTRADE_RATE_LIMIT_BURST)
 _rate_limit_lock = threading.Lock()
 
+# Adaptive retry budget: successes refill tokens, throttles (429/5xx) drain them
+LEAFTRADE_MAX_RPS = float(os.getenv("LEAFTRADE_MAX_RPS", "1"))  # token refill per second
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+TOKEN_BUCKET_CAPACITY = 10
+TOKEN_THROTTLE_COST = 5
+
+# Dispensary metadata changes rarely; reuse the paginated walk for a while
+_DISPENSARY_TTL = float(os.getenv("LEAFTRADE_DISPENSARY_TTL", "300"))  # seconds
+_DISPENSARY_CACHE = {"ts": 0.0, "data": None}
+_dispensary_cache_lock = threading.Lock()
+
+# Placeholders for fields LeafTrade leaves blank
+UNKNOWN_CUSTOMER = "Unknown Customer"
+UNKNOWN_LOCATION = "Unknown Location"
+UNKNOWN_ADDRESS = "Unknown Address"
+UNKNOWN_PRODUCT = "Unknown Product"
+
 # Environment variables
 LEAFTRADE_API_URL = os.getenv("LEAFTRADE_API_URL")
 LEAFTRADE_API_KEY = os.getenv("LEAFTRADE_API_KEY")
 
 
+class _RateLimitedRetry(Retry):
+    """urllib3 Retry whose re-sent requests wait for, and count against, the burst rate limit."""
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        _acquire_slot()
+
+
+# Connection-level retries for idempotent GETs. 429 is left entirely to _make_api_request;
+# final 5xx responses are returned, not raised, so the token bucket sees them.
+_RETRY = _RateLimitedRetry(
+    total=MAX_RETRIES,
+    backoff_factor=0.5,
+    backoff_jitter=1.0,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=False,
+    raise_on_status=False
+)
+
+# Shared HTTP session so pages and order lookups reuse keep-alive connections
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Authorization": f"Token {LEAFTRADE_API_KEY}",
+    "Content-Type": "application/json",
+    "Accept-Encoding": "gzip, deflate"
+})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+atexit.register(_SESSION.close)
+
+
+@dataclass(slots=True)
+class Dispensary:
+    """A LeafTrade dispensary location (one customer delivery point)."""
+    id: str
+    customer_id: Any
+    customer_name: str
+    name: str
+    address: str
+    city: str
+    state: str
+    zip: str
+    country: str
+    phone: str
+
+
+class LeafTradeThrottledError(RequestException):
+    """Raised when LeafTrade throttles a request or the local retry budget is empty."""
+
+
+class _TokenBucket:
+    """Client-side retry budget shared by all LeafTrade calls (adaptive retry mode)."""
+
+    def __init__(self, capacity: float, refill_per_success: float, refill_per_second: float):
+        self.capacity = capacity
+        self.tokens = capacity
+        self.refill_per_success = refill_per_success
+        self.refill_per_second = refill_per_second
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, failing fast when LeafTrade has recently been throttling us."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.refill_per_second)
+            self._last_refill = now
+            if self.tokens < 1:
+                raise LeafTradeThrottledError("LeafTrade retry budget exhausted; failing fast")
+            self.tokens -= 1
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + self.refill_per_success)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.tokens = max(0.0, self.tokens - TOKEN_THROTTLE_COST)
+
+
+_BUCKET = _TokenBucket(TOKEN_BUCKET_CAPACITY, refill_per_success=1, refill_per_second=LEAFTRADE_MAX_RPS)
+
+
 def validate_config() -> bool:
     """Validate that all required environment variables are set."""
     required_vars = {
@@ -77,7 +186,7 @@ def validate_config() -> bool:
 
 
 def retry_on_failure(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
-    """Decorator to retry API calls with exponential backoff."""
+    """Decorator to retry API calls with full-jitter exponential backoff."""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -89,10 +198,12 @@ def retry_on_failure(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY)
                 except (RequestException, Timeout, ConnectionError) as e:
                     last_exception = e
                     if attempt < max_retries:
-                        wait_time = delay * (2 ** attempt)  # Exponential backoff
+                        # Full jitter: random wait up to the capped exponential backoff
+                        backoff_cap = min(delay * (2 ** attempt), MAX_BACKOFF)
+                        wait_time = random.uniform(0, backoff_cap)
                         logger.warning(
                             f"API call failed (attempt {attempt + 1}/{max_retries + 1}): "
-                            f"{func.__name__} - {str(e)}. Retrying in {wait_time}s..."
+                            f"{func.__name__} - {str(e)}. Retrying in {wait_time:.2f}s (cap {backoff_cap}s)..."
                         )
                         time.sleep(wait_time)
                     else:
@@ -115,6 +226,18 @@ def validate_api_key(api_key: str) -> bool:
     return True
 
 
+# Environment variables cannot change mid-process, so validate them once
+_CONFIG_OK = validate_config() and validate_api_key(LEAFTRADE_API_KEY)
+
+
+def _to_cents(value: Any) -> int:
+    """Convert a LeafTrade price (number or decimal string) to integer cents, rounding half up."""
+    try:
+        return int(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
+    except (InvalidOperation, ValueError, TypeError):
+        return 0
+
+
 def validate_status(status: str) -> str:
     """Validate and normalize order status parameter."""
     valid_statuses = ["new", "approved", "processing", "completed", "cancelled"]
@@ -124,14 +247,15 @@ def validate_status(status: str) -> str:
     return status
 
 
-def _wait_for_rate_limit() -> None:
-    """Sleep if needed so we stay under LeafTrade burst limit (100 requests per minute)."""
+def _acquire_slot() -> None:
+    """Wait for, then reserve, a slot under the LeafTrade burst limit (100 requests per minute)."""
     while True:
         with _rate_limit_lock:
             now = time.monotonic()
             while _rate_limit_timestamps and _rate_limit_timestamps[0] < now - LEAFTRADE_RATE_LIMIT_WINDOW:
                 _rate_limit_timestamps.popleft()
             if len(_rate_limit_timestamps) < LEAFTRADE_RATE_LIMIT_BURST:
+                _rate_limit_timestamps.append(now)
                 return
             wait = LEAFTRADE_RATE_LIMIT_WINDOW - (now - _rate_limit_timestamps[0])
         if wait > 0:
@@ -139,52 +263,55 @@ def _wait_for_rate_limit() -> None:
             time.sleep(wait)
 
 
-def _record_request_time() -> None:
-    """Record that a LeafTrade request was made (for burst throttling)."""
-    with _rate_limit_lock:
-        _rate_limit_timestamps.append(time.monotonic())
-
-
-@retry_on_failure()
-def _make_api_request(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None, action: str = "API request") -> Optional[Dict[str, Any]]:
+def _make_api_request(url: str, params: Optional[Dict[str, Any]] = None, action: str = "API request") -> Optional[Dict[str, Any]]:
     """
     Make a standardized API request to LeafTrade with proper error handling.
-    Enforces LeafTrade rate limits (100/min burst; retries once on 429).
+    Enforces LeafTrade rate limits (100/min burst; retries once on 429) and the
+    shared retry budget (throttled responses raise LeafTradeThrottledError).
+    Transient connection and 5xx failures are retried by the session's Retry adapter.
     All LeafTrade HTTP calls must go through this function.
     """
-    if not validate_config():
+    if not _CONFIG_OK:
         raise ValueError("LeafTrade configuration is invalid")
     try:
-        logger.debug(f"Making LeafTrade API request: {action}")
-        logger.debug(f"Request URL: {url}")
-        logger.debug(f"Request headers: {headers}")
-        logger.debug(f"Request params: {params}")
-        _wait_for_rate_limit()
-        response = requests.get(
+        logger.debug("Making LeafTrade API request: %s", action)
+        logger.debug("Request URL: %s", url)
+        logger.debug("Request params: %s", params)
+        _acquire_slot()
+        _BUCKET.acquire()
+        response = _SESSION.get(
             url,
-            headers=headers,
             params=params,
             timeout=REQUEST_TIMEOUT
         )
-        _record_request_time()
         if response.status_code == 429:
+            _BUCKET.on_throttle()
             logger.warning("LeafTrade rate limit (429); retrying once after %ds", LEAFTRADE_429_RETRY_AFTER)
             time.sleep(LEAFTRADE_429_RETRY_AFTER)
-            _wait_for_rate_limit()
-            response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
-            _record_request_time()
+            _acquire_slot()
+            response = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        if response.status_code in THROTTLE_STATUS_CODES:
+            _BUCKET.on_throttle()
+            raise LeafTradeThrottledError(f"LeafTrade returned {response.status_code} for {action}", response=response)
         response.raise_for_status()
+        _BUCKET.on_success()
+        logger.debug("LeafTrade %s Content-Encoding: %s", action, response.headers.get("Content-Encoding"))
         try:
-            json_data = response.json()
-            logger.debug(f"LeafTrade API response for {action}: {json_data}")
+            json_data = orjson.loads(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("LeafTrade API response for %s: %s", action, json_data)
             return json_data
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response for {action}: {e}")
-            logger.error(f"Response content: {response.text[:500]}...")
-            if response.text.startswith('<!doctype') or response.text.startswith('<html'):
+            logger.error(f"Response content: {response.content[:500].decode('utf-8', 'replace')}...")
+            head = response.content[:9].lower()
+            if head.startswith(b'<!doctype') or head.startswith(b'<html'):
                 logger.error(f"Received HTML response instead of JSON for {action}")
                 raise ValueError(f"API returned HTML instead of JSON for {action}")
             raise
+    except LeafTradeThrottledError as e:
+        logger.warning(f"LeafTrade throttled {action}: {e}")
+        raise
     except requests.exceptions.HTTPError as e:
         logger.error(f"HTTP error for {action}: {e.response.status_code} - {e.response.text}")
         raise
@@ -199,80 +326,99 @@ def _make_api_request(url: str, headers: Dict[str, str], params: Optional[Dict[s
         raise
 
 
-def _handle_pagination(base_url: str, headers: Dict[str, str], params: Dict[str, Any], action: str) -> List[Dict[str, Any]]:
+@retry_on_failure()
+def _fetch_page(url: str, params: Dict[str, Any], action: str) -> Optional[Dict[str, Any]]:
+    """Fetch one pagination page, backing off and retrying the page if LeafTrade throttles us."""
+    return _make_api_request(url, params, action)
+
+
+def _iter_pagination(base_url: str, params: Dict[str, Any], action: str, strict: bool = False) -> Iterator[Dict[str, Any]]:
     """
-    Handle pagination for LeafTrade API responses.
+    Yield LeafTrade API results one page at a time, following "next" links.
     
     Args:
         base_url: Base API URL
-        headers: Request headers
         params: Query parameters
         action: Action description for logging
+        strict: Raise when a page fails instead of stopping early with partial results
     
-    Returns:
-        List of all results from all pages
+    Yields:
+        Each result from each page, as soon as its page arrives
     """
-    all_results = []
+    total_results = 0
     next_url = base_url
     
     while next_url:
         try:
             logger.debug(f"Fetching page for {action}: {next_url}")
-            response_data = _make_api_request(next_url, headers, params, f"{action} - page")
-            
-            if response_data and "results" in response_data:
-                page_results = response_data["results"]
-                all_results.extend(page_results)
-                logger.debug(f"Retrieved {len(page_results)} items from current page")
-                
-                # Check for next page
-                next_url = response_data.get("next")
-                if next_url:
-                    logger.debug(f"Next page available: {next_url}")
-                else:
-                    logger.debug("No more pages available")
-            else:
-                logger.error(f"Invalid response structure for {action}: missing 'results' field")
-                break
-                
+            response_data = _fetch_page(next_url, params, f"{action} - page")
         except Exception as e:
             logger.error(f"Failed to fetch page for {action}: {e}")
+            if strict:
+                raise
             break
+        
+        if not response_data or "results" not in response_data:
+            logger.error(f"Invalid response structure for {action}: missing 'results' field")
+            if strict:
+                raise ValueError(f"Invalid response structure for {action}: missing 'results' field")
+            break
+        
+        page_results = response_data["results"]
+        total_results += len(page_results)
+        logger.debug(f"Retrieved {len(page_results)} items from current page")
+        
+        # Check for next page before handing the page to the caller
+        next_url = response_data.get("next")
+        if next_url:
+            logger.debug(f"Next page available: {next_url}")
+        else:
+            logger.debug("No more pages available")
+        
+        yield from page_results
     
-    logger.info(f"Retrieved total of {len(all_results)} items for {action}")
-    return all_results
+    logger.info(f"Retrieved total of {total_results} items for {action}")
+
 
+def invalidate_dispensary_cache() -> None:
+    """Drop cached dispensary info so the next get_dispensary_info() call walks LeafTrade again."""
+    with _dispensary_cache_lock:
+        _DISPENSARY_CACHE["data"] = None
+        _DISPENSARY_CACHE["ts"] = 0.0
 
-def get_dispensary_info() -> Optional[Dict[str, Dict[str, Any]]]:
+
+def get_dispensary_info() -> Optional[Dict[str, Dispensary]]:
     """
     Retrieve dispensary information from LeafTrade with pagination support.
+    Results are cached for LEAFTRADE_DISPENSARY_TTL seconds (default 300).
     
     Returns:
-        Dictionary mapping dispensary_id to dispensary details or None if failed
+        Dictionary mapping dispensary_id to Dispensary records or None if failed
     """
-    if not validate_config():
-        return None
-    
-    if not validate_api_key(LEAFTRADE_API_KEY):
+    if not _CONFIG_OK:
         return None
     
+    with _dispensary_cache_lock:
+        if _DISPENSARY_CACHE["data"] is not None and time.monotonic() - _DISPENSARY_CACHE["ts"] < _DISPENSARY_TTL:
+            logger.debug("Returning cached dispensary info")
+            return _DISPENSARY_CACHE["data"]
+        dispensary_dict = _fetch_dispensary_info()
+        if dispensary_dict is not None:
+            _DISPENSARY_CACHE["data"] = dispensary_dict
+            _DISPENSARY_CACHE["ts"] = time.monotonic()
+        return dispensary_dict
+
+
+def _fetch_dispensary_info() -> Optional[Dict[str, Dispensary]]:
+    """Walk every /dispensaries/ page and build the dispensary location dictionary."""
     endpoint = LEAFTRADE_API_URL + "dispensaries/"
-    headers = {
-        "Authorization": f"Token {LEAFTRADE_API_KEY}",
-        "Content-Type": "application/json"
-    }
     
     try:
-        # Handle pagination for dispensaries
-        dispensaries = _handle_pagination(endpoint, headers, {}, "dispensary_info")
-        
-        if not dispensaries:
-            logger.warning("No dispensaries found")
-            return {}
-        
         dispensary_dict = {}
         
-        for dispensary in dispensaries:
+        # Build the dictionary page by page as dispensaries arrive
+        # Strict so a failed page returns None instead of a partial dict that would be cached
+        for dispensary in _iter_pagination(endpoint, {}, "dispensary_info", strict=True):
             try:
                 customer_id = dispensary.get("id")
                 customer_name = dispensary.get("name", "Unknown")
@@ -285,30 +431,32 @@ def get_dispensary_info() -> Optional[Dict[str, Dict[str, Any]]]:
                 locations = dispensary.get("locations", [])
                 for dispensary_location in locations:
                     try:
-                        dispensary_id = dispensary_location.get("id")
-                        dispensary_name = dispensary_location.get("name", "Unknown")
+                        get = dispensary_location.get
+                        dispensary_id = get("id")
+                        dispensary_name = get("name", "Unknown")
                         
                         # Safely access address information
-                        address = dispensary_location.get("address", {})
-                        dispensary_address = address.get("street_address_1", "")
-                        dispensary_city = address.get("city", "")
-                        dispensary_state = address.get("state", "")
-                        dispensary_zip = address.get("postal_code", "")
-                        dispensary_country = dispensary_location.get("country", "")
-                        dispensary_phone = dispensary_location.get("phone", "")
+                        address_get = get("address", {}).get
+                        dispensary_address = address_get("street_address_1", "")
+                        dispensary_city = address_get("city", "")
+                        dispensary_state = address_get("state", "")
+                        dispensary_zip = address_get("postal_code", "")
+                        dispensary_country = get("country", "")
+                        dispensary_phone = get("phone", "")
                         
                         if dispensary_id:
-                            dispensary_dict[dispensary_id] = {
-                                "customer_id": customer_id,
-                                "customer_name": customer_name,
-                                "name": dispensary_name,
-                                "address": dispensary_address,
-                                "city": dispensary_city,
-                                "state": dispensary_state,
-                                "zip": dispensary_zip,
-                                "country": dispensary_country,
-                                "phone": dispensary_phone
-                            }
+                            dispensary_dict[dispensary_id] = Dispensary(
+                                id=str(dispensary_id),  # String for database consistency
+                                customer_id=customer_id,
+                                customer_name=customer_name,
+                                name=dispensary_name,
+                                address=dispensary_address,
+                                city=dispensary_city,
+                                state=dispensary_state,
+                                zip=dispensary_zip,
+                                country=dispensary_country,
+                                phone=dispensary_phone
+                            )
                     except KeyError as e:
                         logger.warning(f"Dispensary location data missing required field: {e}")
                         continue
@@ -339,21 +487,8 @@ def get_customers() -> Optional[List[Dict[str, Any]]]:
             logger.error("Failed to get dispensary info")
             return None
         
-        # Convert dictionary to list format for consistency
-        customers_list = []
-        for dispensary_id, dispensary_info in dispensary_dict.items():
-            customers_list.append({
-                'id': str(dispensary_id),  # Convert to string for database consistency
-                'customer_id': dispensary_info['customer_id'],
-                'customer_name': dispensary_info['customer_name'],
-                'name': dispensary_info['name'],
-                'address': dispensary_info['address'],
-                'city': dispensary_info['city'],
-                'state': dispensary_info['state'],
-                'zip': dispensary_info['zip'],
-                'country': dispensary_info['country'],
-                'phone': dispensary_info['phone']
-            })
+        # Convert records to list format for consistency
+        customers_list = [asdict(dispensary) for dispensary in dispensary_dict.values()]
         
         logger.info(f"Successfully retrieved {len(customers_list)} customers")
         return customers_list
@@ -373,70 +508,56 @@ def get_orders(status: str = "approved") -> Optional[Dict[str, Dict[str, Any]]]:
     Returns:
         Dictionary mapping order_id to order details or None if failed
     """
-    if not validate_config():
+    if not _CONFIG_OK:
         return None
     
-    headers = {
-        "Authorization": f"Token {LEAFTRADE_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     params = {
         "status": status
     }
     
     try:
         logger.info(f"Fetching orders with status: {status}")
-        orders_data = _handle_pagination(
-            f"{LEAFTRADE_API_URL}/orders/",
-            headers,
-            params,
-            "get_orders"
-        )
-        
-        if orders_data:
-            # Convert list to dictionary format
-            orders_dict = {}
-            for order in orders_data:
-                try:
-                    order_id = order.get("id")
-                    if order_id:
-                        # Extract dispensary location information (this is the customer)
-                        dispensary_location = order.get("dispensary_location", {})
-                        dispensary = dispensary_location.get("dispensary", {})
-                        customer_name = f'{dispensary.get("name", "Unknown Customer")} - {dispensary_location.get("name", "Unknown Location")}'
-                        
-                        # Extract address information from dispensary location
-                        address_info = dispensary_location.get("address", {})
-                        address = address_info.get("street_address_1", "Unknown Address")
-                        city = address_info.get("city", "")
-                        state = address_info.get("state", "")
-                        zip_code = address_info.get("postal_code", "")
-                        
-                        # Format address
-                        full_address = f"{address}, {city}, {state} {zip_code}".strip()
-                        if full_address.endswith(","):
-                            full_address = full_address[:-1]
-                        
-                        orders_dict[str(order_id)] = {
-                            "order_id": str(order_id),
-                            "invoice_id": order.get("invoice_id", ""),
-                            "delivery_date": order.get("delivery_date"),
-                            "customer_name": customer_name,
-                            "customer_location": full_address,
-                            "total_amount": order.get("total_gross", 0),
-                            "created_at": order.get("created_at"),
-                            "updated_at": order.get("updated_at")
-                        }
-                except KeyError as e:
-                    logger.warning(f"Order data missing required field: {e}")
-                    continue
+        # Build the orders dictionary page by page as orders arrive
+        orders_dict = {}
+        for order in _iter_pagination(f"{LEAFTRADE_API_URL}/orders/", params, "get_orders"):
+            order_id = order.get("id")
+            if not order_id:
+                continue
             
-            logger.info(f"Successfully retrieved {len(orders_dict)} orders from LeafTrade")
-            return orders_dict
-        else:
+            # Extract dispensary location information (this is the customer)
+            dispensary_location = order.get("dispensary_location") or {}
+            dispensary = dispensary_location.get("dispensary") or {}
+            customer_name = f'{dispensary.get("name", UNKNOWN_CUSTOMER)} - {dispensary_location.get("name", UNKNOWN_LOCATION)}'
+            
+            # Extract address information from dispensary location
+            address_info = dispensary_location.get("address") or {}
+            address = address_info.get("street_address_1", UNKNOWN_ADDRESS)
+            city = address_info.get("city", "")
+            state = address_info.get("state", "")
+            zip_code = address_info.get("postal_code", "")
+            
+            # Format address from the non-empty parts
+            parts = [p for p in (address, city, f"{state} {zip_code}".strip()) if p]
+            full_address = ", ".join(parts) or UNKNOWN_ADDRESS
+            
+            order_id = str(order_id)
+            orders_dict[order_id] = {
+                "order_id": order_id,
+                "invoice_id": order.get("invoice_id", ""),
+                "delivery_date": order.get("delivery_date"),
+                "customer_name": customer_name,
+                "customer_location": full_address,
+                "total_amount": order.get("total_gross", 0),
+                "created_at": order.get("created_at"),
+                "updated_at": order.get("updated_at")
+            }
+        
+        if not orders_dict:
             logger.error("Failed to retrieve orders from LeafTrade")
             return None
+        
+        logger.info(f"Successfully retrieved {len(orders_dict)} orders from LeafTrade")
+        return orders_dict
             
     except Exception as e:
         logger.error(f"Error fetching orders: {e}")
@@ -447,6 +568,8 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve complete order details including line items from LeafTrade API.
     Uses simple in-memory cache with 5-minute TTL.
+    Line item prices are exact integer cents (unit_price_cents, total_price_cents);
+    unit_price and total_price keep the existing dollar fields, derived from the cents.
     
     Args:
         order_id: LeafTrade order ID
@@ -454,7 +577,7 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Complete order details dictionary or None if failed
     """
-    if not validate_config():
+    if not _CONFIG_OK:
         return None
     
     if not order_id:
@@ -469,17 +592,12 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
         logger.debug(f"Returning cached order details for order {order_id}")
         return cached_data
     
-    headers = {
-        "Authorization": f"Token {LEAFTRADE_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     try:
         logger.info(f"Fetching complete details for order: {order_id}")
         
         # Get order details
         order_url = f"{LEAFTRADE_API_URL}/orders/{order_id}/"
-        order_response = _make_api_request(order_url, headers, {}, f"get_order_details_{order_id}")
+        order_response = _make_api_request(order_url, {}, f"get_order_details_{order_id}")
         
         if not order_response:
             logger.error(f"Failed to retrieve order details for order {order_id}")
@@ -491,19 +609,20 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
         
         for item in items_data:
             try:
+                get = item.get
                 # Extract product information from the item structure
-                product_name = item.get("product_name", "Unknown Product")
-                product_sku = item.get("product_sku", "")
+                product_name = get("product_name", UNKNOWN_PRODUCT)
+                product_sku = get("product_sku", "")
                 
                 # Extract inventory information
-                pull_number = item.get("pull_number", "")
-                raw_barcode_id = item.get("batch_ref", "")  # Using batch_ref as barcode_id
+                pull_number = get("pull_number", "")
+                raw_barcode_id = get("batch_ref", "")  # Using batch_ref as barcode_id
                 
                 # Normalize barcode_id: remove spaces to match BioTrack format
                 barcode_id = raw_barcode_id.replace(" ", "") if raw_barcode_id else ""
                 
                 # Ensure quantity is consistently typed as integer
-                quantity = item.get("units", 0)
+                quantity = get("units", 0)
                 if quantity is not None:
                     try:
                         quantity = int(quantity)
@@ -512,16 +631,20 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
                 else:
                     quantity = 0
                 
+                unit_cents = _to_cents(get("unit_price_net", 0))
+                total_cents = unit_cents * quantity
                 line_item = {
-                    "id": item.get("id"),
+                    "id": get("id"),
                     "product_name": product_name,
                     "product_sku": product_sku,
                     "quantity": quantity,
-                    "unit_price": item.get("unit_price_net", 0),
-                    "total_price": item.get("unit_price_net", 0) * quantity,
+                    "unit_price_cents": unit_cents,
+                    "total_price_cents": total_cents,
+                    "unit_price": unit_cents / 100,
+                    "total_price": total_cents / 100,
                     "pull_number": pull_number,
                     "barcode_id": barcode_id,
-                    "inventory_id": item.get("stock_id"),
+                    "inventory_id": get("stock_id"),
                     "notes": ""
                 }
                 line_items.append(line_item)
@@ -545,3 +668,25 @@ def get_order_details(order_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Error fetching order details for order {order_id}: {e}")
         return None
 
+
+
+def get_order_details_bulk(order_ids: List[str], max_workers: int = 8) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Retrieve complete order details for many orders concurrently over the shared session.
+    
+    Args:
+        order_ids: LeafTrade order IDs
+        max_workers: Concurrent requests (kept within the session's connection pool)
+    
+    Returns:
+        Dictionary mapping each order ID to its get_order_details result (None if failed)
+    """
+    if not order_ids:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(get_order_details, order_id): order_id for order_id in order_ids}
+        results = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    logger.info(f"Retrieved details for {sum(1 for details in results.values() if details)}/{len(order_ids)} orders")
+    return results
@@ -417,12 +417,10 @@ def new_trip():
             
             logger.debug("Backend validation passed")
             
-            # Get driver database IDs from biotrack_ids
-            driver1 = db.session.query(Driver).filter_by(biotrack_id=data['driver1_id']).first()
-            driver2 = db.session.query(Driver).filter_by(biotrack_id=data['driver2_id']).first() if data['driver2_id'] else None
-            
-            # Get vehicle database ID from biotrack_id
-            vehicle = db.session.query(Vehicle).filter_by(biotrack_id=str(data['vehicle_id'])).first()
+            # Drivers and vehicle were resolved from their biotrack_ids during validation
+            driver1 = validation_result['driver1']
+            driver2 = validation_result['driver2']
+            vehicle = validation_result['vehicle']
             
             # Parse date and time with DST handling
             delivery_date = datetime.strptime(data['delivery_date'], '%Y-%m-%d').date()
@@ -448,30 +446,54 @@ def new_trip():
             
             logger.debug(f"Trip ID generated: {trip.id}")
             
+            # Fetch order details for all orders concurrently to find dispensary locations and vendors
+            try:
+                from api.leaftrade import get_order_details_bulk
+                order_details_by_id = get_order_details_bulk([order_data['order_id'] for order_data in data['orders']])
+            except Exception as e:
+                logger.error(f"Error getting order details for trip orders: {str(e)}")
+                order_details_by_id = {}
+            
+            # Resolve every dispensary location's vendor in one query (first mapping per location wins)
+            # LeafTrade ids may arrive as strings; the mapping column is an Integer
+            location_ids = {
+                int(location_id)
+                for location_id in (
+                    ((order_details.get('order') or {}).get('dispensary_location') or {}).get('id')
+                    for order_details in order_details_by_id.values() if order_details
+                )
+                if str(location_id).isdigit()
+            }
+            vendor_by_location_id = {}
+            if location_ids:
+                location_vendors = db.session.query(LocationMapping.leaftrade_dispensary_location_id, Vendor).outerjoin(
+                    Vendor, Vendor.biotrack_vendor_id == LocationMapping.biotrack_vendor_id
+                ).filter(
+                    LocationMapping.leaftrade_dispensary_location_id.in_(location_ids)
+                ).order_by(LocationMapping.id).all()
+                for location_id, location_vendor in location_vendors:
+                    vendor_by_location_id.setdefault(location_id, location_vendor)
+            
             # Add trip orders with sequence
             for i, order_data in enumerate(data['orders']):
-                # Get order details to find dispensary location and vendor
                 vendor = None
                 try:
-                    from api.leaftrade import get_order_details
-                    order_details = get_order_details(order_data['order_id'])
+                    order_details = order_details_by_id.get(order_data['order_id'])
                     if order_details:
                         # Extract dispensary location ID
                         dispensary_location_id = order_details.get('order', {}).get('dispensary_location', {}).get('id')
                         if dispensary_location_id:
-                            # Find location mapping
-                            location_mapping = db.session.query(LocationMapping).filter_by(
-                                leaftrade_dispensary_location_id=dispensary_location_id
-                            ).first()
-                            
-                            if location_mapping:
-                                # Find vendor through location mapping
-                                vendor = db.session.query(Vendor).filter_by(
-                                    biotrack_vendor_id=location_mapping.biotrack_vendor_id
-                                ).first()
-                                logger.debug(f"Found vendor {vendor.name if vendor else 'None'} for order {order_data['order_id']}")
+                            try:
+                                location_id = int(dispensary_location_id)
+                            except (TypeError, ValueError):
+                                logger.error(f"Non-integer dispensary location ID {dispensary_location_id!r} for order {order_data['order_id']}")
                             else:
-                                logger.warning(f"No location mapping found for dispensary location {dispensary_location_id}")
+                                # Vendor found through location mapping
+                                vendor = vendor_by_location_id.get(location_id)
+                                if vendor:
+                                    logger.debug(f"Found vendor {vendor.name} for order {order_data['order_id']}")
+                                else:
+                                    logger.warning(f"No location mapping found for dispensary location {dispensary_location_id}")
                         else:
                             logger.warning(f"No dispensary location ID found for order {order_data['order_id']}")
                     else:
@@ -510,7 +532,8 @@ def new_trip():
 def validate_trip_data_backend(data):
     """
     Comprehensive backend validation for trip data
-    Returns: {'is_valid': bool, 'message': str}
+    Returns: {'is_valid': bool, 'message': str}, plus the resolved 'driver1',
+    'driver2' (or None) and 'vehicle' records when valid
     """
     logger = logging.getLogger('app.validation')
     
@@ -571,9 +594,14 @@ def validate_trip_data_backend(data):
             'message': 'Driver 1 and Driver 2 must be different'
         }
     
-    # Validation 6: Verify drivers exist in database (look up by biotrack_id)
-    driver1 = db.session.query(Driver).filter_by(biotrack_id=driver1_id).first()
-    driver2 = db.session.query(Driver).filter_by(biotrack_id=driver2_id).first() if driver2_id else None
+    # Validation 6: Verify drivers exist in database (one lookup by biotrack_id for both)
+    driver_ids = [driver1_id, driver2_id] if driver2_id else [driver1_id]
+    drivers_by_biotrack_id = {
+        driver.biotrack_id: driver
+        for driver in db.session.query(Driver).filter(Driver.biotrack_id.in_(driver_ids)).all()
+    }
+    driver1 = drivers_by_biotrack_id.get(driver1_id)
+    driver2 = drivers_by_biotrack_id.get(driver2_id) if driver2_id else None
     if not driver1:
         return {
             'is_valid': False,
@@ -630,7 +658,10 @@ def validate_trip_data_backend(data):
     logger.info("Backend validation passed successfully")
     return {
         'is_valid': True,
-        'message': 'Validation passed'
+        'message': 'Validation passed',
+        'driver1': driver1,
+        'driver2': driver2,
+        'vehicle': vehicle
     }
 
 @app.route('/trips/<int:trip_id>/execute', methods=['POST'])
@@ -894,10 +925,14 @@ def _order_total_usable_weight(order_details, inventory_data):
             continue
         batch_ref = str(batch_ref).replace(' ', '').strip()
         units = line_item.get('quantity', 0)
+        # Integer strings are the common case; only fall back to float for values like "2.0"
         try:
             units = int(units)
         except (TypeError, ValueError):
-            units = 0
+            try:
+                units = int(float(units))
+            except (TypeError, ValueError):
+                units = 0
         inv_item = inv_by_id.get(batch_ref)
         if not inv_item and batch_ref.isdigit():
             inv_item = inventory_data.get(int(batch_ref))
@@ -958,17 +993,17 @@ def get_orders_weights():
     if not order_ids:
         return jsonify({})
     try:
-        from api.leaftrade import get_order_details as leaftrade_get_order_details
+        from api.leaftrade import get_order_details_bulk
         from api.biotrack import get_auth_token, get_inventory_info
         token = get_auth_token()
         inventory_data = get_inventory_info(token) if token else None
         if not inventory_data:
             return jsonify({str(oid): 0.0 for oid in order_ids})
+        order_details = get_order_details_bulk(order_ids)
         weights = {}
         for oid in order_ids:
             try:
-                details = leaftrade_get_order_details(oid)
-                w = _order_total_usable_weight(details, inventory_data)
+                w = _order_total_usable_weight(order_details.get(oid), inventory_data)
                 weights[str(oid)] = float(w)
             except Exception as e:
                 logger.debug("Order %s weight failed: %s", oid, e)
@@ -1218,6 +1253,7 @@ def refresh_drivers():
         
         # Fetch drivers from BioTrack
         logger.debug("Calling BioTrack API to fetch drivers")
+        get_driver_info.invalidate()  # explicit refresh bypasses the sync TTL cache
         drivers_data = get_driver_info(token)
         
         if drivers_data is None:
@@ -1228,13 +1264,13 @@ def refresh_drivers():
         for driver_id, driver_info in drivers_data.items():
             existing_driver = db.session.query(Driver).filter_by(biotrack_id=driver_id).first()
             if existing_driver:
-                existing_driver.name = driver_info['name']
-                existing_driver.is_active = bool(driver_info['is_active'])
+                existing_driver.name = driver_info.name
+                existing_driver.is_active = bool(driver_info.is_active)
             else:
                 new_driver = Driver(
                     biotrack_id=driver_id,
-                    name=driver_info['name'],
-                    is_active=bool(driver_info['is_active'])
+                    name=driver_info.name,
+                    is_active=bool(driver_info.is_active)
                 )
                 db.session.add(new_driver)
         
@@ -1245,8 +1281,8 @@ def refresh_drivers():
         for driver_id, driver_info in drivers_data.items():
             drivers_array.append({
                 'id': driver_id,
-                'name': driver_info['name'],
-                'is_active': driver_info['is_active']
+                'name': driver_info.name,
+                'is_active': driver_info.is_active
             })
         
         logger.info(f"Successfully refreshed and cached {len(drivers_array)} drivers from BioTrack")
@@ -1317,6 +1353,7 @@ def refresh_vehicles():
         
         # Fetch vehicles from BioTrack
         logger.debug("Calling BioTrack API to fetch vehicles")
+        get_vehicle_info.invalidate()  # explicit refresh bypasses the sync TTL cache
         vehicles_data = get_vehicle_info(token)
         
         if vehicles_data is None:
@@ -1327,13 +1364,13 @@ def refresh_vehicles():
         for vehicle_id, vehicle_info in vehicles_data.items():
             existing_vehicle = db.session.query(Vehicle).filter_by(biotrack_id=vehicle_id).first()
             if existing_vehicle:
-                existing_vehicle.name = vehicle_info['name']
-                existing_vehicle.is_active = bool(vehicle_info['is_active'])
+                existing_vehicle.name = vehicle_info.name
+                existing_vehicle.is_active = bool(vehicle_info.is_active)
             else:
                 new_vehicle = Vehicle(
                     biotrack_id=vehicle_id,
-                    name=vehicle_info['name'],
-                    is_active=bool(vehicle_info['is_active'])
+                    name=vehicle_info.name,
+                    is_active=bool(vehicle_info.is_active)
                 )
                 db.session.add(new_vehicle)
         
@@ -1344,8 +1381,8 @@ def refresh_vehicles():
         for vehicle_id, vehicle_info in vehicles_data.items():
             vehicles_array.append({
                 'id': vehicle_id,
-                'name': vehicle_info['name'],
-                'is_active': vehicle_info['is_active']
+                'name': vehicle_info.name,
+                'is_active': vehicle_info.is_active
             })
         
         logger.info(f"Successfully refreshed and cached {len(vehicles_array)} vehicles from BioTrack")
@@ -1438,6 +1475,7 @@ def refresh_rooms():
         
         # Fetch rooms from BioTrack
         logger.debug("Calling BioTrack API to fetch rooms")
+        get_room_info.invalidate()  # explicit refresh bypasses the sync TTL cache
         rooms_data = get_room_info(token)
         
         if rooms_data is None:
@@ -1450,13 +1488,13 @@ def refresh_rooms():
             room_id_str = str(room_id)
             existing_room = db.session.query(Room).filter_by(biotrack_room_id=room_id_str).first()
             if existing_room:
-                existing_room.name = room_info['name']
-                existing_room.is_active = room_info['is_active'] == 1
+                existing_room.name = room_info.name
+                existing_room.is_active = room_info.is_active == 1
             else:
                 new_room = Room(
                     biotrack_room_id=room_id_str,
-                    name=room_info['name'],
-                    is_active=room_info['is_active'] == 1
+                    name=room_info.name,
+                    is_active=room_info.is_active == 1
                 )
                 db.session.add(new_room)
         
@@ -1484,8 +1522,8 @@ def refresh_rooms():
         for room_id, room_info in rooms_data.items():
             rooms_array.append({
                 'id': str(room_id),  # Convert to string for consistency
-                'name': room_info['name'],
-                'is_active': room_info['is_active']
+                'name': room_info.name,
+                'is_active': room_info.is_active
             })
         
         logger.info(f"Successfully refreshed and cached {len(rooms_array)} rooms from BioTrack")
@@ -1547,6 +1585,7 @@ def refresh_vendors():
         
         # Fetch vendors from BioTrack
         logger.debug("Calling BioTrack API to fetch vendors")
+        get_vendor_info.invalidate()  # explicit refresh bypasses the sync TTL cache
         vendors_data = get_vendor_info(token)
         
         if vendors_data is None:
@@ -1652,7 +1691,7 @@ def get_customers():
 def refresh_customers():
     """API endpoint to refresh customers from LeafTrade"""
     try:
-        from api.leaftrade import get_customers
+        from api.leaftrade import get_customers, invalidate_dispensary_cache
         from models import Customer, APIRefreshLog
         
         logger = logging.getLogger('app.refresh_customers')
@@ -1660,6 +1699,7 @@ def refresh_customers():
         
         # Fetch customers from LeafTrade
         logger.debug("Calling LeafTrade API to fetch customers")
+        invalidate_dispensary_cache()  # explicit refresh bypasses the dispensary TTL cache
         customers_data = get_customers()
         
         if customers_data is None:
@@ -2125,86 +2165,52 @@ def refresh_biotrack_data():
         logger = logging.getLogger('app.refresh_biotrack_data')
         logger.info(f"Starting BioTrack data refresh in training mode: {get_training_mode()}")
         
+        from api.biotrack import get_auth_token, get_all_sync_info, get_driver_info, get_vehicle_info, get_vendor_info, get_room_info
+        
+        token = get_auth_token()
+        if not token:
+            logger.error("Failed to get authentication token from BioTrack")
+            return jsonify({'error': 'Failed to authenticate with BioTrack'}), 500
+        
+        # Explicit refresh bypasses the sync TTL caches; the four syncs run concurrently
+        for getter in (get_driver_info, get_vehicle_info, get_vendor_info, get_room_info):
+            getter.invalidate()
+        sync_data = get_all_sync_info(token)
+        
+        # Only clear local data once every sync succeeded
+        failed = [name for name, data in sync_data.items() if data is None]
+        if failed:
+            logger.error(f"BioTrack sync failed for: {', '.join(failed)}")
+            return jsonify({'error': f'Error refreshing {", ".join(failed)} from BioTrack'}), 500
+        
         # Clear existing BioTrack data
         db.session.query(Driver).delete()
         db.session.query(Vehicle).delete()
         db.session.query(Vendor).delete()
         db.session.query(Room).delete()
-        db.session.commit()
         logger.info("Cleared existing BioTrack data")
         
-        # Refresh drivers
-        try:
-            from api.biotrack import get_driver_info
-            drivers_data = get_driver_info()
-            if drivers_data:
-                for driver in drivers_data:
-                    new_driver = Driver(
-                        biotrack_id=driver['id'],
-                        name=driver['name'],
-                        license_number=driver.get('license_number', ''),
-                        is_active=driver.get('is_active', True)
-                    )
-                    db.session.add(new_driver)
-                logger.info(f"Added {len(drivers_data)} drivers")
-        except Exception as e:
-            logger.error(f"Error refreshing drivers: {str(e)}")
-            return jsonify({'error': f'Error refreshing drivers: {str(e)}'}), 500
+        for driver_id, driver_info in sync_data['drivers'].items():
+            db.session.add(Driver(biotrack_id=driver_id, name=driver_info.name, is_active=bool(driver_info.is_active)))
+        logger.info(f"Added {len(sync_data['drivers'])} drivers")
         
-        # Refresh vehicles
-        try:
-            from api.biotrack import get_vehicle_info
-            vehicles_data = get_vehicle_info()
-            if vehicles_data:
-                for vehicle in vehicles_data:
-                    new_vehicle = Vehicle(
-                        biotrack_id=vehicle['id'],
-                        name=vehicle['name'],
-                        license_plate=vehicle.get('license_plate', ''),
-                        is_active=vehicle.get('is_active', True)
-                    )
-                    db.session.add(new_vehicle)
-                logger.info(f"Added {len(vehicles_data)} vehicles")
-        except Exception as e:
-            logger.error(f"Error refreshing vehicles: {str(e)}")
-            return jsonify({'error': f'Error refreshing vehicles: {str(e)}'}), 500
+        for vehicle_id, vehicle_info in sync_data['vehicles'].items():
+            db.session.add(Vehicle(biotrack_id=vehicle_id, name=vehicle_info.name, is_active=bool(vehicle_info.is_active)))
+        logger.info(f"Added {len(sync_data['vehicles'])} vehicles")
         
-        # Refresh vendors
-        try:
-            from api.biotrack import get_vendor_info
-            vendors_data = get_vendor_info()
-            if vendors_data:
-                for vendor_location, vendor_info in vendors_data.items():
-                    new_vendor = Vendor(
-                        biotrack_vendor_id=vendor_location,
-                        name=vendor_info['name'],
-                        license_info=vendor_info.get('license', ''),
-                        ubi=vendor_info.get('ubi', ''),
-                        is_active=True
-                    )
-                    db.session.add(new_vendor)
-                logger.info(f"Added {len(vendors_data)} vendors")
-        except Exception as e:
-            logger.error(f"Error refreshing vendors: {str(e)}")
-            return jsonify({'error': f'Error refreshing vendors: {str(e)}'}), 500
+        for vendor_location, vendor_info in sync_data['vendors'].items():
+            db.session.add(Vendor(
+                biotrack_vendor_id=vendor_location,
+                name=vendor_info['name'],
+                license_info=vendor_info.get('license', ''),
+                ubi=vendor_info.get('ubi', ''),
+                is_active=True
+            ))
+        logger.info(f"Added {len(sync_data['vendors'])} vendors")
         
-        # Refresh rooms
-        try:
-            from api.biotrack import get_room_info
-            rooms_data = get_room_info()
-            if rooms_data:
-                for room in rooms_data:
-                    new_room = Room(
-                        biotrack_id=room['id'],
-                        name=room['name'],
-                        vendor_id=room.get('vendor_id'),
-                        is_active=room.get('is_active', True)
-                    )
-                    db.session.add(new_room)
-                logger.info(f"Added {len(rooms_data)} rooms")
-        except Exception as e:
-            logger.error(f"Error refreshing rooms: {str(e)}")
-            return jsonify({'error': f'Error refreshing rooms: {str(e)}'}), 500
+        for room_id, room_info in sync_data['rooms'].items():
+            db.session.add(Room(biotrack_room_id=str(room_id), name=room_info.name, is_active=room_info.is_active == 1))
+        logger.info(f"Added {len(sync_data['rooms'])} rooms")
         
         # Commit all changes
         db.session.commit()
@@ -2999,7 +3005,7 @@ def test_finished_goods_report():
     logger.info("Testing finished goods report data retrieval")
     
     try:
-        from api.biotrack import get_auth_token, get_inventory_info, get_room_info, get_inventory_qa_check
+        from api.biotrack import get_auth_token, get_inventory_info, get_room_info, get_inventory_qa_check_many
         import time
         
         # Authenticate with BioTrack
@@ -3025,7 +3031,7 @@ def test_finished_goods_report():
         room_data = get_room_info(token)
         room_lookup = {}
         if room_data:
-            room_lookup = {room_id: room_info['name'] for room_id, room_info in room_data.items()}
+            room_lookup = {room_id: room_info.name for room_id, room_info in room_data.items()}
         
         # Get selected rooms from preferences
         selected_rooms = []
@@ -3058,17 +3064,15 @@ def test_finished_goods_report():
         test_items = []
         start_time = time.time()
         
-        for i, (item_id, item_info) in enumerate(pre_filtered_items[:10]):  # Test first 10 items
+        sample_items = [
+            (item_id, item_info, str(item_info.get('barcode_id') or item_info.get('barcode') or item_id))
+            for item_id, item_info in pre_filtered_items[:10]  # Test first 10 items
+        ]
+        lab_lookup = get_inventory_qa_check_many(token, [barcode_id for _, _, barcode_id in sample_items]) or {}
+        
+        for item_id, item_info, barcode_id in sample_items:
             try:
-                barcode_id = str(item_info.get('barcode_id') or item_info.get('barcode') or item_id)
-                lab_results = None
-                
-                if barcode_id:
-                    try:
-                        lab_results = get_inventory_qa_check(token, barcode_id)
-                    except Exception as e:
-                        logger.warning(f"Error getting lab data for barcode {barcode_id}: {str(e)}")
-                        lab_results = None
+                lab_results = lab_lookup.get(barcode_id)
                 
                 test_items.append({
                     'item_id': str(item_id),
@@ -10,7 +10,7 @@ from datetime import datetime
 from io import StringIO
 from flask import current_app
 from models import db, GlobalPreference
-from api.biotrack import get_auth_token, get_inventory_info, get_room_info, get_inventory_qa_check
+from api.biotrack import get_auth_token, get_cached_auth_token, get_inventory_info, get_room_info, get_inventory_qa_check_many
 
 logger = logging.getLogger('utils.rpt_generation')
 
@@ -40,7 +40,7 @@ def generate_inventory_report_simple():
             room_data = get_room_info(token)
             room_lookup = {}
             if room_data:
-                room_lookup = {room_id: room_info['name'] for room_id, room_info in room_data.items()}
+                room_lookup = {room_id: room_info.name for room_id, room_info in room_data.items()}
             
             # Generate CSV
             logger.info(f"Processing {len(inventory_data)} inventory items")
@@ -89,7 +89,7 @@ def generate_finished_goods_report_simple():
             room_data = get_room_info(token)
             room_lookup = {}
             if room_data:
-                room_lookup = {room_id: room_info['name'] for room_id, room_info in room_data.items()}
+                room_lookup = {room_id: room_info.name for room_id, room_info in room_data.items()}
             
             # Generate filtered CSV
             logger.info(f"Processing {len(inventory_data)} inventory items with filtering")
@@ -160,6 +160,9 @@ def _create_inventory_csv(inventory_data, room_lookup):
         'THC %', 'CBDA %', 'CBD %'
     ])
     
+    # Fetch lab data for all items up front
+    lab_lookup = _get_lab_results(_get_barcode_id(item_id, item_info) for item_id, item_info in inventory_data.items())
+    
     # Process inventory items
     for item_id, item_info in inventory_data.items():
         try:
@@ -167,15 +170,8 @@ def _create_inventory_csv(inventory_data, room_lookup):
             current_room_id = item_info.get('currentroom', '')
             current_room_name = room_lookup.get(current_room_id, 'Unknown Room')
             
-            # Try to get lab data
-            barcode_id = str(item_info.get('barcode_id') or item_info.get('barcode') or item_id)
-            lab_results = None
-            
-            if barcode_id:
-                try:
-                    lab_results = get_inventory_qa_check(get_auth_token(), barcode_id)
-                except Exception:
-                    lab_results = None
+            # Look up lab data
+            lab_results = lab_lookup.get(_get_barcode_id(item_id, item_info))
             
             # Lab data fields
             if lab_results:
@@ -211,6 +207,18 @@ def _create_inventory_csv(inventory_data, room_lookup):
     output.seek(0)
     return output.getvalue()
 
+def _get_barcode_id(item_id, item_info):
+    """Get the barcode used for QA lookups of an inventory item"""
+    return str(item_info.get('barcode_id') or item_info.get('barcode') or item_id)
+
+def _get_lab_results(barcode_ids):
+    """Fetch lab results for many barcodes with concurrent BioTrack QA checks"""
+    try:
+        return get_inventory_qa_check_many(get_cached_auth_token(), list(barcode_ids)) or {}
+    except Exception as e:
+        logger.warning(f"Error fetching lab data: {str(e)}")
+        return {}
+
 def _calculate_pull_number(product_name):
     """Calculate pull number from product name: C00800 + last 5 characters"""
     if not product_name:
@@ -248,31 +256,27 @@ def _create_finished_goods_csv(inventory_data, room_lookup, selected_rooms):
     # Define finished goods inventory types
     finished_goods_types = [22, 23, 24, 25, 28, 34, 35, 36, 37, 38, 39, 45, 62]
     
-    # Process inventory items with filtering
-    for item_id, item_info in inventory_data.items():
+    # Filter by selected rooms and inventory type
+    filtered_items = [
+        (item_id, item_info) for item_id, item_info in inventory_data.items()
+        if (not selected_rooms or str(item_info.get('currentroom', '')) in selected_rooms)
+        and item_info.get('inventorytype') in finished_goods_types
+    ]
+    
+    # Fetch lab data for the filtered items up front
+    lab_lookup = _get_lab_results(_get_barcode_id(item_id, item_info) for item_id, item_info in filtered_items)
+    
+    # Process filtered inventory items
+    for item_id, item_info in filtered_items:
         try:
-            # Filter by selected rooms
             current_room_id = item_info.get('currentroom', '')
-            if selected_rooms and str(current_room_id) not in selected_rooms:
-                continue
-            
-            # Filter by inventory type
             inventory_type = item_info.get('inventorytype')
-            if inventory_type not in finished_goods_types:
-                continue
             
             # Get room name
             current_room_name = room_lookup.get(current_room_id, 'Unknown Room')
             
-            # Try to get lab data
-            barcode_id = str(item_info.get('barcode_id') or item_info.get('barcode') or item_id)
-            lab_results = None
-            
-            if barcode_id:
-                try:
-                    lab_results = get_inventory_qa_check(get_auth_token(), barcode_id)
-                except Exception:
-                    lab_results = None
+            # Look up lab data
+            lab_results = lab_lookup.get(_get_barcode_id(item_id, item_info))
             
             # Only include items with lab data (QA passed)
             if not lab_results: